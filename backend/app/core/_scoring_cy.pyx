@@ -0,0 +1,48 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Precompiled scoring kernel for deployments without Numba.
+Same arithmetic as scoring_kernel._score_kernel; build with `python setup.py build_ext --inplace`.
+"""
+
+cdef double[3] _ROLE_F = [1.25, 1.0, 0.85]  # lead, participant, listening
+cdef double[2] _CONTROL_F = [0.85, 1.0]  # optional, mandatory
+cdef double[3] _ENV_F = [0.8, 1.0, 1.25]  # low_stim, med_stim, high_stim
+
+
+cpdef double score_kernel(
+    double base,
+    int dur_min,
+    bint b2b,
+    int role_i,
+    double fam,
+    int ctrl_i,
+    int env_i,
+    bint video,
+    double p_mult,
+) noexcept nogil:
+    cdef double duration_factor = 1.0 + 0.4 * (dur_min / 60.0)
+    cdef double b2b_factor = 1.3 if b2b else 1.0
+    cdef double video_factor = 1.15 if video else 1.0
+    cdef double raw
+    cdef double impact
+
+    raw = (
+        base
+        * duration_factor
+        * b2b_factor
+        * _ROLE_F[role_i]
+        * (1.0 - 0.25 * fam)
+        * _CONTROL_F[ctrl_i]
+        * _ENV_F[env_i]
+        * video_factor
+        * p_mult
+    )
+
+    # Round half away from zero to 2 decimals
+    impact = <long long>(raw * 100.0 + (0.5 if raw >= 0 else -0.5)) / 100.0
+
+    # Prevent negative zero and tiny noise
+    if impact < 0.5 and impact > -0.5:
+        impact = 0.0
+
+    return impact
@@ -1,11 +1,16 @@
+# Score: 0-100
+_PLABEL = ("Introvert",) * 40 + ("Omnivert",) * 21 + ("Extrovert",) * 40
+
+# Linear interpolation from 1.3 (score=0) down to 0.7 (score=100), one entry per score
+_PMULT = tuple(1.3 + (0.7 - 1.3) * (i / 100.0) for i in range(101))
+
+# Scoring relies on the multiplier never dropping below 0.6; if the range above is
+# ever widened, clamp inside the generator instead of at every call site
+assert min(_PMULT) >= 0.6
+
+
 def personality_label(score: int) -> str:
-    # Score: 0-100
-    if score <= 39:
-        return "Introvert"
-    elif score <= 60:
-        return "Omnivert"
-    else:
-        return "Extrovert"
+    return _PLABEL[max(0, min(100, int(score)))]
 
 
 def personality_multiplier(score: int) -> float:
@@ -14,10 +19,4 @@ def personality_multiplier(score: int) -> float:
     Introverts drain more ~1.3
     Extroverts drain less ~0.7
     """
-    score = max(0, min(100, int(score)))
-
-    # Linear interpolation from 1.3 (score=0) down to 0.7 (score=100)
-    start = 1.3
-    end = 0.7
-    t = score / 100.0
-    return start + (end - start) * t
+    return _PMULT[max(0, min(100, int(score)))]
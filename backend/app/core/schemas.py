@@ -2,9 +2,9 @@ from __future__ import annotations
 
 from enum import Enum
 from datetime import datetime
-from typing import List, Optional, Literal
+from typing import Optional, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class EventType(str, Enum):
@@ -34,15 +34,32 @@ class Environment(str, Enum):
     high_stim = "high_stim"
 
 
+# Enum -> index into the scoring factor tables (see scoring_kernel.py)
+_ROLE_IDX = {Role.lead: 0, Role.participant: 1, Role.listening: 2}
+_CONTROL_IDX = {Control.optional: 0, Control.mandatory: 1}
+_ENV_IDX = {Environment.low_stim: 0, Environment.med_stim: 1, Environment.high_stim: 2}
+
+
 class ScoringModifiers(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     role: Role = Role.participant
     control: Control = Control.mandatory
     environment: Environment = Environment.med_stim
     familiarity: float = Field(0.5, ge=0.0, le=1.0, description="0=strangers, 1=trusted")
     back_to_back: bool = False
 
+    @property
+    def indexes(self) -> Tuple[int, int, int]:
+        """
+        (role, control, environment) as indexes into the scoring factor tables.
+        """
+        return _ROLE_IDX[self.role], _CONTROL_IDX[self.control], _ENV_IDX[self.environment]
+
 
 class NormalizedEvent(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: str
     title: str
     start: datetime
@@ -56,10 +73,16 @@ class NormalizedEvent(BaseModel):
     modifiers: ScoringModifiers = ScoringModifiers()
 
 
-ImpactLabel = Literal["Low", "Medium", "High", "Extreme"]
+class ImpactLabel(str, Enum):
+    Low = "Low"
+    Medium = "Medium"
+    High = "High"
+    Extreme = "Extreme"
 
 
 class ScoreResult(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     impact_score: float  # negative = draining, positive = recharging
     impact_label: ImpactLabel
-    reasons: List[str] = []
+    reasons: Tuple[str, ...] = ()
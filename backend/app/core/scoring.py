@@ -1,8 +1,23 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime
-from .schemas import NormalizedEvent, ScoreResult, EventType
-from .personality import personality_multiplier
+from functools import cache, lru_cache
+from typing import Callable, Tuple
+from .schemas import (
+    NormalizedEvent,
+    ScoreResult,
+    ImpactLabel,
+    EventType,
+    ScoringModifiers,
+)
+from .personality import personality_multiplier, _PMULT
+
+# Prefer the precompiled Cython kernel when it has been built (see backend/setup.py)
+try:
+    from ._scoring_cy import score_kernel as _score_kernel
+except ImportError:
+    from .scoring_kernel import _score_kernel
 
 # Base energy cost per event type (positive = recharge, negative = drain)
 BASE_COST = {
@@ -15,88 +30,189 @@ BASE_COST = {
     EventType.custom: -5.0,
 }
 
+_DEFAULT_MODIFIERS = ScoringModifiers()
+
+# Intensity labels, indexed by how many of the 2 / 6 / 12 thresholds |impact| reaches
+_LABELS = (ImpactLabel.Low, ImpactLabel.Medium, ImpactLabel.High, ImpactLabel.Extreme)
+
 
 def minutes_between(a: datetime, b: datetime) -> int:
     return max(0, int((b - a).total_seconds() // 60))
 
 
-def _label_for_impact(impact: float) -> str:
+def _label_for_impact(impact: float) -> ImpactLabel:
     """
     Frontend expects: Low | Medium | High | Extreme
     Label is intensity based on |impact|, regardless of sign.
     Sign lives in impact_score (negative = drain, positive = boost).
     """
     mag = abs(impact)
-    if mag >= 12:
-        return "Extreme"
-    if mag >= 6:
-        return "High"
-    if mag >= 2:
-        return "Medium"
-    return "Low"
-
-
-def score_event(event: NormalizedEvent, personality_score: int) -> ScoreResult:
-    etype = event.user_override_type or event.event_type
-    base = BASE_COST.get(etype, -6.0)
-
-    duration_min = minutes_between(event.start, event.end)
-    duration_factor = 1.0 + 0.4 * (duration_min / 60)
-
-    b2b_factor = 1.3 if event.modifiers.back_to_back else 1.0
-
-    role_factor = {
-        "lead": 1.25,
-        "participant": 1.0,
-        "listening": 0.85,
-    }[event.modifiers.role.value]
-
-    familiarity_factor = 1.0 - 0.25 * event.modifiers.familiarity
-
-    control_factor = 0.85 if event.modifiers.control.value == "optional" else 1.0
-
-    environment_factor = {
-        "low_stim": 0.8,
-        "med_stim": 1.0,
-        "high_stim": 1.25,
-    }[event.modifiers.environment.value]
-
-    video_factor = 1.15 if event.has_video else 1.0
-
-    p_mult = max(0.6, float(personality_multiplier(personality_score)))
-
-    raw = (
-        base
-        * duration_factor
-        * b2b_factor
-        * role_factor
-        * familiarity_factor
-        * control_factor
-        * environment_factor
-        * video_factor
-        * p_mult
-    )
+    return _LABELS[(mag >= 2) + (mag >= 6) + (mag >= 12)]
 
-    impact = round(raw, 2)
 
-    # Prevent negative zero and tiny noise
-    if abs(impact) < 0.5:
-        impact = 0.0
-
-    reasons = []
-    reasons.append(f"Base {etype.value} cost")
-    if duration_min > 30:
+@cache
+def _reason_table(etype: EventType, mask: int) -> Tuple[str, ...]:
+    """
+    Shared, immutable reasons tuple per (event type, long<<2 | b2b<<1 | video).
+    """
+    reasons = [f"Base {etype.value} cost"]
+    if mask & 0b100:
         reasons.append("Long duration increases intensity")
-    if event.modifiers.back_to_back:
+    if mask & 0b010:
         reasons.append("Back-to-back fatigue")
-    if event.has_video:
+    if mask & 0b001:
         reasons.append("Video fatigue")
     reasons.append("Personality factor applied")
+    return tuple(reasons)
 
-    label = _label_for_impact(impact)
+
+def _reasons_for(etype: EventType, dur_min: int, b2b: bool, video: bool) -> Tuple[str, ...]:
+    return _reason_table(etype, ((dur_min > 30) << 2) | (bool(b2b) << 1) | bool(video))
+
+
+@dataclass(slots=True, frozen=True)
+class RawEvent:
+    """
+    Flattened, scoring-only view of a NormalizedEvent.
+    Enums are resolved to table indexes once, so the hot path only does slot loads.
+    """
+
+    event_type: EventType
+    base_cost: float
+    dur_min: int
+    b2b: bool
+    role_i: int
+    fam: float
+    ctrl_i: int
+    env_i: int
+    has_video: bool
+
+    @classmethod
+    def from_normalized(cls, ev: NormalizedEvent) -> "RawEvent":
+        etype = ev.user_override_type or ev.event_type
+        m = ev.modifiers
+        role_i, ctrl_i, env_i = m.indexes
+        return cls(
+            event_type=etype,
+            base_cost=BASE_COST.get(etype, -6.0),
+            dur_min=minutes_between(ev.start, ev.end),
+            b2b=m.back_to_back,
+            role_i=role_i,
+            fam=m.familiarity,
+            ctrl_i=ctrl_i,
+            env_i=env_i,
+            has_video=ev.has_video,
+        )
+
+    @classmethod
+    def from_fields(
+        cls,
+        event_type: EventType,
+        start: datetime,
+        end: datetime,
+        has_video: bool,
+        modifiers: ScoringModifiers = _DEFAULT_MODIFIERS,
+    ) -> "RawEvent":
+        """
+        Same as from_normalized, without building a NormalizedEvent first.
+        """
+        role_i, ctrl_i, env_i = modifiers.indexes
+        return cls(
+            event_type=event_type,
+            base_cost=BASE_COST.get(event_type, -6.0),
+            dur_min=minutes_between(start, end),
+            b2b=modifiers.back_to_back,
+            role_i=role_i,
+            fam=modifiers.familiarity,
+            ctrl_i=ctrl_i,
+            env_i=env_i,
+            has_video=has_video,
+        )
+
+
+@lru_cache(maxsize=4096)
+def _score_pure(
+    base: float,
+    dur_min: int,
+    b2b: bool,
+    role_i: int,
+    fam: float,
+    ctrl_i: int,
+    env_i: int,
+    video: bool,
+    p_mult: float,
+) -> Tuple[float, ImpactLabel]:
+    """
+    Memoized (impact, label) for one set of scoring inputs.
+    No external state, so repeated re-scores of an unchanged event are a dict hit.
+    """
+    impact = _score_kernel(base, dur_min, b2b, role_i, fam, ctrl_i, env_i, video, p_mult)
+    return impact, _label_for_impact(impact)
+
+
+def score_event(event: RawEvent, personality_score: int, _fast: bool = False) -> ScoreResult:
+    impact, label = _score_pure(
+        event.base_cost,
+        event.dur_min,
+        event.b2b,
+        event.role_i,
+        event.fam,
+        event.ctrl_i,
+        event.env_i,
+        event.has_video,
+        personality_multiplier(personality_score),
+    )
+
+    reasons = _reasons_for(event.event_type, event.dur_min, event.b2b, event.has_video)
+
+    # Our own kernel output is already well-typed, so callers may skip validation
+    if _fast:
+        return ScoreResult.model_construct(
+            impact_score=impact,
+            impact_label=label,
+            reasons=reasons,
+        )
 
     return ScoreResult(
         impact_score=impact,
         impact_label=label,
         reasons=reasons,
     )
+
+
+def score_event_model(event: NormalizedEvent, personality_score: int, _fast: bool = False) -> ScoreResult:
+    return score_event(RawEvent.from_normalized(event), personality_score, _fast=_fast)
+
+
+def make_scorer(personality_score: int) -> Callable[[RawEvent], ScoreResult]:
+    """
+    Scorer specialized for one personality score.
+    p_mult is looked up once and folded into the base cost, so each event skips
+    the personality_multiplier call and one multiply.
+    """
+    return _make_scorer(max(0, min(100, int(personality_score))))
+
+
+@lru_cache(maxsize=101)
+def _make_scorer(score: int) -> Callable[[RawEvent], ScoreResult]:
+    p_mult = _PMULT[score]
+
+    def scorer(event: RawEvent) -> ScoreResult:
+        impact, label = _score_pure(
+            event.base_cost * p_mult,
+            event.dur_min,
+            event.b2b,
+            event.role_i,
+            event.fam,
+            event.ctrl_i,
+            event.env_i,
+            event.has_video,
+            1.0,
+        )
+        return ScoreResult(
+            impact_score=impact,
+            impact_label=label,
+            reasons=_reasons_for(event.event_type, event.dur_min, event.b2b, event.has_video),
+        )
+
+    return scorer
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple, Union
+
+import numpy as np
+
+# numexpr is optional: it fuses the factor product into one pass without temporaries
+try:
+    import numexpr
+except Exception:
+    numexpr = None  # type: ignore
+
+from .schemas import NormalizedEvent, ScoreResult, EventType
+from .scoring import BASE_COST, _reasons_for, _LABELS
+from .scoring_kernel import _ROLE_F, _CONTROL_F, _ENV_F
+from .personality import personality_multiplier, _PMULT
+
+# EventType -> small int (declaration order in schemas.py)
+_EVENT_TYPES = tuple(EventType)
+_EVENT_TYPE_IDX = {t: i for i, t in enumerate(EventType)}
+
+# The batch path computes in float32: scores are rounded to 0.01, so float64 only
+# doubles the memory traffic
+_F32_ONE = np.float32(1.0)
+_B2B_F = np.float32(1.3)
+_VIDEO_F = np.float32(1.15)
+
+# Factor lookup tables, indexed by ScoringModifiers.indexes
+ROLE_ARR = np.array(_ROLE_F, dtype=np.float32)
+CONTROL_ARR = np.array(_CONTROL_F, dtype=np.float32)
+ENV_ARR = np.array(_ENV_F, dtype=np.float32)
+
+# Personality multiplier per score 0..100
+_PMULT_ARR = np.array(_PMULT, dtype=np.float32)
+
+# Q16 fixed-point versions of the tables (factor * 2**16)
+_Q16_ONE = 1 << 16
+_Q16_HALF = 1 << 15
+_ROLE_Q = np.rint(ROLE_ARR * _Q16_ONE).astype(np.int32)
+_CONTROL_Q = np.rint(CONTROL_ARR * _Q16_ONE).astype(np.int32)
+_ENV_Q = np.rint(ENV_ARR * _Q16_ONE).astype(np.int32)
+_B2B_Q = int(round(1.3 * _Q16_ONE))
+_VIDEO_Q = int(round(1.15 * _Q16_ONE))
+
+# Label thresholds on |impact|; searchsorted gives the index into _LABELS
+_THRESH = np.array([2.0, 6.0, 12.0])
+_LABELS_ARR = np.array([lbl.value for lbl in _LABELS])
+
+
+@dataclass(slots=True)
+class EventColumns:
+    """
+    Struct-of-Arrays view of a list of events: one typed NumPy column per scoring input.
+    """
+
+    etype_i: np.ndarray  # int8, index into EventType (only used for reasons)
+    base_cost: np.ndarray  # float32
+    start_epoch_s: np.ndarray  # int64
+    end_epoch_s: np.ndarray  # int64
+    dur_min: np.ndarray  # int32, derived from the epoch columns
+    role_i: np.ndarray  # int8
+    fam: np.ndarray  # float32
+    env_i: np.ndarray  # int8
+    ctrl_i: np.ndarray  # int8
+    b2b: np.ndarray  # bool_
+    video: np.ndarray  # bool_
+
+    def __len__(self) -> int:
+        return len(self.base_cost)
+
+    @classmethod
+    def from_events(cls, events: Sequence[NormalizedEvent]) -> "EventColumns":
+        n = len(events)
+        cols = cls(
+            etype_i=np.empty(n, dtype=np.int8),
+            base_cost=np.empty(n, dtype=np.float32),
+            start_epoch_s=np.empty(n, dtype=np.int64),
+            end_epoch_s=np.empty(n, dtype=np.int64),
+            dur_min=np.empty(0, dtype=np.int32),
+            role_i=np.empty(n, dtype=np.int8),
+            fam=np.empty(n, dtype=np.float32),
+            env_i=np.empty(n, dtype=np.int8),
+            ctrl_i=np.empty(n, dtype=np.int8),
+            b2b=np.empty(n, dtype=np.bool_),
+            video=np.empty(n, dtype=np.bool_),
+        )
+
+        for i, ev in enumerate(events):
+            etype = ev.user_override_type or ev.event_type
+            m = ev.modifiers
+            role_i, ctrl_i, env_i = m.indexes
+            cols.etype_i[i] = _EVENT_TYPE_IDX[etype]
+            cols.base_cost[i] = BASE_COST.get(etype, -6.0)
+            cols.start_epoch_s[i] = int(ev.start.timestamp())
+            cols.end_epoch_s[i] = int(ev.end.timestamp())
+            cols.role_i[i] = role_i
+            cols.fam[i] = m.familiarity
+            cols.env_i[i] = env_i
+            cols.ctrl_i[i] = ctrl_i
+            cols.b2b[i] = m.back_to_back
+            cols.video[i] = ev.has_video
+
+        # Vectorized minutes_between: one int subtract + divide for all events
+        cols.dur_min = np.maximum(0, (cols.end_epoch_s - cols.start_epoch_s) // 60).astype(np.int32)
+
+        return cols
+
+
+def _factor_columns(cols: EventColumns) -> Tuple[np.ndarray, ...]:
+    """
+    Per-event float32 factors, in score_event's multiply order (excluding p_mult).
+    """
+    return (
+        1.0 + 0.4 * (cols.dur_min.astype(np.float32) / 60.0),
+        np.where(cols.b2b, _B2B_F, _F32_ONE),
+        ROLE_ARR[cols.role_i],
+        1.0 - 0.25 * cols.fam,
+        CONTROL_ARR[cols.ctrl_i],
+        ENV_ARR[cols.env_i],
+        np.where(cols.video, _VIDEO_F, _F32_ONE),
+    )
+
+
+def _raw_product(cols: EventColumns, p_mult: float) -> np.ndarray:
+    df, bf, rf, ff, cf, ef, vf = _factor_columns(cols)
+    pm = np.float32(p_mult)
+
+    if numexpr is not None:
+        return numexpr.evaluate(
+            "base * df * bf * rf * ff * cf * ef * vf * pm",
+            local_dict={
+                "base": cols.base_cost,
+                "df": df,
+                "bf": bf,
+                "rf": rf,
+                "ff": ff,
+                "cf": cf,
+                "ef": ef,
+                "vf": vf,
+                "pm": pm,
+            },
+        )
+
+    return cols.base_cost * df * bf * rf * ff * cf * ef * vf * pm
+
+
+def _round_impact(raw: np.ndarray) -> np.ndarray:
+    # Round in float64 so the values serialize as clean 2-decimal floats
+    impact = np.rint(raw.astype(np.float64) * 100.0) / 100.0
+
+    # Prevent negative zero and tiny noise
+    return np.where(np.abs(impact) < 0.5, 0.0, impact)
+
+
+def _to_q16(x) -> np.ndarray:
+    return np.rint(np.asarray(x) * _Q16_ONE).astype(np.int32)
+
+
+def _raw_product_q16(cols: EventColumns, p_mult: float) -> np.ndarray:
+    """
+    Same product as _raw_product, folded in Q16 fixed point.
+    Each factor is an int32 scaled by 2**16; the running product is int64 and is
+    shifted back (rounding) after every multiply so it can't overflow.
+    """
+    factors = (
+        _to_q16(1.0 + 0.4 * (cols.dur_min / 60.0)),
+        np.where(cols.b2b, _B2B_Q, _Q16_ONE),
+        _ROLE_Q[cols.role_i],
+        _to_q16(1.0 - 0.25 * cols.fam.astype(np.float64)),
+        _CONTROL_Q[cols.ctrl_i],
+        _ENV_Q[cols.env_i],
+        np.where(cols.video, _VIDEO_Q, _Q16_ONE),
+        _to_q16(p_mult),
+    )
+
+    acc = _to_q16(cols.base_cost).astype(np.int64)
+    for f in factors:
+        acc = (acc * f + _Q16_HALF) >> 16
+
+    return acc / float(_Q16_ONE)
+
+
+def score_events(
+    events: Union[Sequence[NormalizedEvent], EventColumns],
+    personality_score: int,
+    fixed_point: bool = False,
+) -> np.ndarray:
+    """
+    Batch version of score_event: returns impact_score for every event.
+    Accepts either a list of NormalizedEvent or pre-built EventColumns.
+    fixed_point=True folds the product in Q16 integers instead of floats.
+    """
+    cols = events if isinstance(events, EventColumns) else EventColumns.from_events(events)
+
+    p_mult = personality_multiplier(personality_score)
+
+    raw = _raw_product_q16(cols, p_mult) if fixed_point else _raw_product(cols, p_mult)
+
+    return _round_impact(raw)
+
+
+def personality_multiplier_vec(scores: np.ndarray) -> np.ndarray:
+    """
+    Vectorized personality_multiplier for many users at once.
+    """
+    return _PMULT_ARR[np.clip(np.asarray(scores).astype(np.int32), 0, 100)]
+
+
+def score_events_multi_user(
+    events: Union[Sequence[NormalizedEvent], EventColumns],
+    personality_scores: np.ndarray,
+) -> np.ndarray:
+    """
+    Score the same events for several users: returns a (n_users, n_events) array.
+    The personality-independent product is computed once and scaled per user.
+    """
+    cols = events if isinstance(events, EventColumns) else EventColumns.from_events(events)
+
+    raw = np.multiply.outer(personality_multiplier_vec(personality_scores), _raw_product(cols, 1.0))
+
+    return _round_impact(raw)
+
+
+def impact_labels(impact: np.ndarray) -> np.ndarray:
+    """
+    Vectorized _label_for_impact: Low | Medium | High | Extreme by |impact|.
+    """
+    return _LABELS_ARR[_label_index(impact)]
+
+
+def _label_index(impact: np.ndarray) -> np.ndarray:
+    return np.searchsorted(_THRESH, np.abs(impact), side="right")
+
+
+def score_results(
+    events: Union[Sequence[NormalizedEvent], EventColumns],
+    personality_score: int,
+) -> List[ScoreResult]:
+    """
+    Batch scoring that returns one ScoreResult per event, in input order.
+    """
+    cols = events if isinstance(events, EventColumns) else EventColumns.from_events(events)
+    impact = score_events(cols, personality_score)
+    label_i = _label_index(impact)
+
+    # Inputs come straight from the kernel above, so skip Pydantic validation
+    return [
+        ScoreResult.model_construct(
+            impact_score=float(impact[i]),
+            impact_label=_LABELS[label_i[i]],
+            reasons=_reasons_for(
+                _EVENT_TYPES[cols.etype_i[i]],
+                int(cols.dur_min[i]),
+                bool(cols.b2b[i]),
+                bool(cols.video[i]),
+            ),
+        )
+        for i in range(len(cols))
+    ]
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+# Numba is optional: without it the kernel runs as plain Python
+try:
+    from numba import njit
+except Exception:
+
+    def njit(*args, **kwargs):  # type: ignore
+        def wrap(fn):
+            return fn
+
+        return wrap
+
+
+# Factor tables indexed by enum ordinal (see scoring.py)
+_ROLE_F = (1.25, 1.0, 0.85)  # lead, participant, listening
+_CONTROL_F = (0.85, 1.0)  # optional, mandatory
+_ENV_F = (0.8, 1.0, 1.25)  # low_stim, med_stim, high_stim
+
+
+def _score_kernel_py(
+    base: float,
+    dur_min: int,
+    b2b: bool,
+    role_i: int,
+    fam: float,
+    ctrl_i: int,
+    env_i: int,
+    video: bool,
+    p_mult: float,
+) -> float:
+    """
+    Pure-numeric core of score_event. Returns the rounded impact score.
+    """
+    duration_factor = 1.0 + 0.4 * (dur_min / 60)
+    b2b_factor = 1.3 if b2b else 1.0
+    video_factor = 1.15 if video else 1.0
+
+    raw = (
+        base
+        * duration_factor
+        * b2b_factor
+        * _ROLE_F[role_i]
+        * (1.0 - 0.25 * fam)
+        * _CONTROL_F[ctrl_i]
+        * _ENV_F[env_i]
+        * video_factor
+        * p_mult
+    )
+
+    # Round half away from zero to 2 decimals without the round() builtin
+    impact = int(raw * 100.0 + (0.5 if raw >= 0 else -0.5)) / 100.0
+
+    # Prevent negative zero and tiny noise
+    if abs(impact) < 0.5:
+        impact = 0.0
+
+    return impact
+
+
+# Fast-math without reciprocal/reassociation flags, so the product order and the
+# final /100.0 stay exact and scores print as clean 2-decimal floats
+_FASTMATH = {"nnan", "ninf", "nsz"}
+
+try:
+    _score_kernel = njit(cache=True, fastmath=_FASTMATH)(_score_kernel_py)
+    # Load (or compile and write) the on-disk cache now rather than on the first request
+    _score_kernel(1.0, 0, False, 0, 0.0, 0, 0, False, 1.0)
+except Exception:
+    # The cache index records the module's import name, so a cache written as
+    # app.core.scoring_kernel fails to load as backend.app.core.scoring_kernel
+    # (and vice versa). Compile in-process instead.
+    _score_kernel = njit(fastmath=_FASTMATH)(_score_kernel_py)
@@ -8,35 +8,78 @@ Date: 1/16/2026
 # Imports
 # ------------------
 import os
+import re
 import json
+import asyncio
+import base64
+import hashlib
+import queue
 import sqlite3
+import threading
+import time
 import traceback
 import warnings
 from uuid import uuid4
 from pathlib import Path
+from contextlib import contextmanager, asynccontextmanager, suppress
+from functools import lru_cache
+from itertools import chain
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Any
+from typing import Optional, Any, Union
 
+import anyio
+import numpy as np
+import httplib2
+import itsdangerous
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request, Body, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, RedirectResponse, PlainTextResponse
+from fastapi.responses import JSONResponse, RedirectResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.middleware.sessions import SessionMiddleware
+from starlette.requests import cookie_parser
 
 from google_auth_oauthlib.flow import Flow
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request as GoogleRequest
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.errors import HttpError
+from googleapiclient.model import JsonModel
 
 from .core.schemas import NormalizedEvent, EventType
-from .core.scoring import score_event
+from .core.scoring import RawEvent, make_scorer
+from .core.scoring_batch import EventColumns, score_results
 
 # OpenAI SDK (used to call Hugging Face OpenAI-compatible router)
 try:
-    from openai import OpenAI
+    import httpx
+    from openai import OpenAI, AsyncOpenAI
 except Exception:
+    httpx = None  # type: ignore
     OpenAI = None  # type: ignore
+    AsyncOpenAI = None  # type: ignore
+
+# HTTP/2 for the HF router needs the h2 package (httpx[http2]); otherwise keep HTTP/1.1
+try:
+    import h2  # noqa: F401
+
+    _HTTP2 = True
+except Exception:
+    _HTTP2 = False
+
+# C ISO-8601 parser; _parse_dt falls back to datetime.fromisoformat without it
+try:
+    import ciso8601
+except Exception:
+    ciso8601 = None  # type: ignore
+
+# orjson is optional: _json_dumps/_json_loads and the API responses fall back to json
+try:
+    import orjson
+except Exception:
+    orjson = None  # type: ignore
 
 
 # ------------------
@@ -76,19 +119,286 @@ HF_TOKEN = os.getenv("HF_TOKEN")
 HF_BASE_URL = os.getenv("HF_BASE_URL", "https://router.huggingface.co/v1")
 HF_MODEL = os.getenv("HF_MODEL", "google/gemma-2-2b-it")
 LLM_TIMEOUT_SECONDS = int(os.getenv("LLM_TIMEOUT_SECONDS", "20"))
+# Provider prompt-cache routing key; set to empty to stop sending it
+LLM_PROMPT_CACHE_KEY = os.getenv("LLM_PROMPT_CACHE_KEY", f"sbf:{HF_MODEL}:v2")
+# Completion budget per scored event; the reply is one small JSON object per event
+LLM_MAX_TOKENS_PER_EVENT = max(16, int(os.getenv("LLM_MAX_TOKENS_PER_EVENT", "160")))
+# Ask for response_format=json_object; turn off for providers that reject it
+LLM_JSON_MODE = os.getenv("LLM_JSON_MODE", "1").strip().lower() not in ("0", "false", "no", "off")
+# Circuit breaker: after this many consecutive HF failures, score locally for the cooldown
+LLM_BREAKER_FAILURES = max(1, int(os.getenv("LLM_BREAKER_FAILURES", "5")))
+LLM_BREAKER_COOLDOWN_SECONDS = float(os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", "30"))
+# Events per chat completion when scoring a window of events at once
+LLM_BATCH_SIZE = max(1, int(os.getenv("LLM_BATCH_SIZE", "20")))
+
+
+class CircuitOpenError(RuntimeError):
+    pass
 
+
+class LLMTruncatedError(RuntimeError):
+    """
+    The completion stopped at max_tokens (finish_reason "length") before its JSON closed.
+    """
+
+
+class CircuitBreaker:
+    """
+    In-process circuit breaker. Opens after `threshold` consecutive failures; while
+    open, call() fails fast with CircuitOpenError. Once `cooldown` seconds have passed
+    calls go through again, and the next failure re-opens it straight away.
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._fails = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            return self._fails < self.threshold or time.monotonic() - self._opened_at >= self.cooldown
+
+    def record_success(self):
+        with self._lock:
+            self._fails = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._fails += 1
+            if self._fails >= self.threshold:
+                self._opened_at = time.monotonic()
+
+    def status(self) -> dict:
+        with self._lock:
+            remaining = self.cooldown - (time.monotonic() - self._opened_at)
+            is_open = self._fails >= self.threshold and remaining > 0
+            return {
+                "state": "open" if is_open else "closed",
+                "consecutive_failures": self._fails,
+                "retry_in_seconds": round(remaining, 1) if is_open else 0.0,
+            }
+
+    def call(self, fn, *args, **kwargs):
+        if not self.allow():
+            raise CircuitOpenError("HF circuit open")
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    async def acall(self, fn, *args, **kwargs):
+        if not self.allow():
+            raise CircuitOpenError("HF circuit open")
+        try:
+            result = await fn(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+
+_hf_breaker = CircuitBreaker(LLM_BREAKER_FAILURES, LLM_BREAKER_COOLDOWN_SECONDS)
+
+
+def _hf_httpx_limits():
+    return httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+
+# One pooled keep-alive client for the process; the async one is created by the app lifespan
 _hf_client = None
+_hf_async_client = None
 if USE_LLM_SCORING and HF_TOKEN and OpenAI is not None:
-    _hf_client = OpenAI(base_url=HF_BASE_URL, api_key=HF_TOKEN)
+    _hf_client = OpenAI(
+        base_url=HF_BASE_URL,
+        api_key=HF_TOKEN,
+        timeout=LLM_TIMEOUT_SECONDS,
+        http_client=httpx.Client(http2=_HTTP2, limits=_hf_httpx_limits(), timeout=LLM_TIMEOUT_SECONDS),
+    )
+
+# ---- Semantic cache for LLM scores ----
+# Exact feature-hash hits always apply. The embedding fallback needs sentence-transformers,
+# an optional dependency (not in requirements.txt; it pulls in torch):
+#     pip install sentence-transformers
+SEMANTIC_CACHE_MODEL = os.getenv("SEMANTIC_CACHE_MODEL", "BAAI/bge-small-en-v1.5")
+SEMANTIC_CACHE_MIN_SIM = float(os.getenv("SEMANTIC_CACHE_MIN_SIM", "0.95"))
+# Most recent cached titles kept in memory per categorical key for the embedding fallback
+SEMANTIC_CACHE_MAX_ROWS = max(1, int(os.getenv("SEMANTIC_CACHE_MAX_ROWS", "2000")))
+# Load the embedding model in the background at startup instead of on the first cache miss
+SEMANTIC_CACHE_WARMUP = os.getenv("SEMANTIC_CACHE_WARMUP", "1").strip().lower() not in ("0", "false", "no", "off")
+
+# Read-only SQLite connections kept open alongside the single writer
+DB_READERS = max(1, int(os.getenv("DB_READERS", "4")))
+
+# Sync routes run in AnyIO's threadpool (40 threads by default). With LLM scoring on,
+# each scoring request holds a thread for the whole HF round-trip, so allow more.
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "200" if USE_LLM_SCORING else "40"))
+
+# Background scoring worker: how long to wait for more events before sending a batch
+SCORING_COALESCE_SECONDS = float(os.getenv("SCORING_COALESCE_SECONDS", "0.05"))
+
+# Full Google syncs look at least this far ahead, so later syncs of a shorter window can
+# reuse the stored syncToken instead of listing the whole window again
+GOOGLE_SYNC_HORIZON_HOURS = max(1, int(os.getenv("GOOGLE_SYNC_HORIZON_HOURS", "168")))
+# A sync that upserts at least this many events re-runs ANALYZE on the events table
+SYNC_ANALYZE_MIN_ROWS = max(1, int(os.getenv("SYNC_ANALYZE_MIN_ROWS", "500")))
+
+
+# ------------------
+# JSON
+# ------------------
+def _json_dumps(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+
+def _json_loads(s: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(s)
+    return json.loads(s)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Default response class: orjson when installed, otherwise Starlette's JSONResponse.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+class FastGoogleJsonModel(JsonModel):
+    """
+    googleapiclient response model that parses bodies with _json_loads (orjson when
+    installed), straight from the response bytes. Non-JSON bodies go to the stock model.
+    """
+
+    def deserialize(self, content):
+        try:
+            body = _json_loads(content)
+        except ValueError:
+            return super().deserialize(content)
+        if self._data_wrapper and isinstance(body, dict) and "data" in body:
+            body = body["data"]
+        return body
+
+
+_google_json_model = FastGoogleJsonModel()
+
+
+@lru_cache(maxsize=1)
+def _calendar_discovery_doc() -> Optional[dict]:
+    """
+    The bundled Calendar v3 discovery document, parsed once per process.
+    build() re-reads and re-parses it (~130 KB of JSON) on every call.
+    """
+    raw = get_static_doc("calendar", "v3")
+    if raw is None:
+        return None
+    doc = _json_loads(raw)
+
+    # build_from_document fills the standard query parameters into each method's
+    # description the first time it is used; do that once here, so concurrent
+    # request threads only ever reassign existing keys in the shared dict
+    service = build_from_document(doc, http=httplib2.Http(), model=_google_json_model)
+    for name in doc.get("resources", {}):
+        getattr(service, name)()
+    return doc
+
+
+def _calendar_service(creds: Credentials):
+    # The client itself is per request: it wraps this user's credentials in its own
+    # (not thread-safe) httplib2 connection, so only the discovery parse is shared
+    doc = _calendar_discovery_doc()
+    if doc is None:
+        return build("calendar", "v3", credentials=creds, model=_google_json_model)
+    return build_from_document(doc, credentials=creds, model=_google_json_model)
 
 
 # ------------------
 # DB
 # ------------------
-def get_db():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+class DBPool:
+    """
+    Process-wide SQLite connections: one writer serialized by a lock, plus up to
+    `readers` read-only connections. With WAL, reads don't block on the writer.
+    """
+
+    def __init__(self, path: Path, readers: int = 4):
+        self.path = path
+        self.max_readers = readers
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.Lock()
+        self._readers: queue.Queue = queue.Queue()
+        self._n_readers = 0
+        self._readers_lock = threading.Lock()
+
+    def _setup(self, conn: sqlite3.Connection) -> sqlite3.Connection:
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute("PRAGMA mmap_size=268435456")
+        # Per-connection settings; the connections are long-lived, so the cache stays warm
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")  # KiB
+        # Bounds ANALYZE to a sample of each index, so it stays cheap on large databases
+        conn.execute("PRAGMA analysis_limit=1000")
+        return conn
+
+    def _writer_conn(self) -> sqlite3.Connection:
+        if self._writer is None:
+            self._writer = self._setup(sqlite3.connect(self.path, check_same_thread=False))
+        return self._writer
+
+    def _reader_conn(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._readers_lock:
+            if self._n_readers < self.max_readers:
+                self._n_readers += 1
+                return self._setup(
+                    sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+                )
+        return self._readers.get()
+
+    @contextmanager
+    def write(self, immediate: bool = False):
+        """
+        Exclusive use of the writer; commits on success, rolls back on error.
+        sqlite3 only opens a transaction at the first INSERT/UPDATE/DELETE; pass
+        immediate=True when leading SELECTs must be part of the same transaction.
+        """
+        with self._write_lock:
+            conn = self._writer_conn()
+            try:
+                if immediate:
+                    conn.execute("BEGIN IMMEDIATE")
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+    @contextmanager
+    def read(self):
+        conn = self._reader_conn()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+
+db = DBPool(DB_PATH, readers=DB_READERS)
 
 
 def _try_add_column(conn: sqlite3.Connection, table: str, coldef: str):
@@ -103,7 +413,13 @@ def _try_add_column(conn: sqlite3.Connection, table: str, coldef: str):
 
 
 def init_db():
-    conn = get_db()
+    with db.write() as conn:
+        _init_db(conn)
+
+
+def _init_db(conn: sqlite3.Connection):
+    # WAL is persistent in the database file; readers can run alongside the writer
+    conn.execute("PRAGMA journal_mode=WAL")
 
     conn.execute(
         """
@@ -150,6 +466,78 @@ def init_db():
         )
         """
     )
+    # Covers the override columns read by the events LEFT JOIN, so the join never
+    # touches the table itself
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_overrides_cover
+        ON google_overrides(user_id, event_id, event_type, attendee_count, has_video, has_conference_link)
+        """
+    )
+    # Any override write (insert, or the upsert's DO UPDATE) bumps the event and clears its
+    # cached score in the same statement, so the event is rescored with the new values.
+    # The updated_at bump is also what stops an in-flight background score, computed before
+    # the override, from landing: _PERSIST_SCORE_IF_CURRENT_SQL only matches the queued version.
+    for op in ("INSERT", "UPDATE"):
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_override_invalidate_{op.lower()}
+            AFTER {op} ON google_overrides
+            BEGIN
+                UPDATE events
+                SET updated_at=NEW.updated_at,
+                    scored_at=NULL, impact_score=NULL, impact_label=NULL, reasons_json=NULL,
+                    scoring_source=NULL, scoring_model=NULL
+                WHERE id=NEW.event_id AND user_id=NEW.user_id;
+            END
+            """
+        )
+
+    # Google incremental sync: the syncToken from the last full/incremental list, and the
+    # end of the window the full sync covered (the token never returns events past it)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS google_sync_state (
+            user_id TEXT PRIMARY KEY,
+            sync_token TEXT NOT NULL,
+            time_max TEXT NOT NULL,              -- ISO datetime (UTC)
+            updated_at TEXT NOT NULL
+        )
+        """
+    )
+
+    # LLM score cache shared across events/users with the same scoring features
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS scoring_cache (
+            feature_hash TEXT PRIMARY KEY,
+            event_type TEXT NOT NULL,
+            attendee_bucket INTEGER NOT NULL,
+            duration_bucket INTEGER,
+            has_video INTEGER NOT NULL,
+            has_conference_link INTEGER NOT NULL,
+            personality_score INTEGER NOT NULL,
+            embedding BLOB,                      -- float32 title embedding (normalized)
+            impact_score REAL NOT NULL,
+            impact_label TEXT NOT NULL,
+            reasons_json TEXT NOT NULL,
+            model TEXT,
+            created_at TEXT NOT NULL
+        )
+        """
+    )
+    # Rows cached before duration_bucket existed stay NULL and never match the embedding lookup
+    _try_add_column(conn, "scoring_cache", "duration_bucket INTEGER")
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_scoring_cache_features_dur
+        ON scoring_cache(
+            event_type, attendee_bucket, duration_bucket, has_video, has_conference_link,
+            personality_score, model
+        )
+        """
+    )
+    conn.execute("DROP INDEX IF EXISTS idx_scoring_cache_features")
 
     # Persisted scoring fields (cache LLM output)
     _try_add_column(conn, "events", "impact_score REAL")
@@ -159,14 +547,65 @@ def init_db():
     _try_add_column(conn, "events", "scoring_source TEXT")  # 'llm' or 'local'
     _try_add_column(conn, "events", "scoring_model TEXT")
 
-    conn.commit()
-    conn.close()
+    # Window probe; the score timestamps let "needs scoring" filter on the index alone.
+    # Supersedes the old (user_id, start, end) index, which is a prefix of this one.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_events_user_window_scored "
+        "ON events(user_id, start, end, scored_at, updated_at)"
+    )
+    conn.execute("DROP INDEX IF EXISTS idx_events_user_window")
+
+    # Refresh planner statistics so the indexes above are picked (sampled, see _setup)
+    conn.execute("ANALYZE")
 
 
 # ------------------
 # APP + MIDDLEWARE
 # ------------------
-app = FastAPI(title="Social Battery Forecaster")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _score_queue, _score_loop, _hf_async_client
+
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+
+    # LLM scoring moves off the request path; local scoring is fast enough to stay inline
+    worker = None
+    if _hf_client is not None:
+        if AsyncOpenAI is not None and HF_TOKEN:
+            _hf_async_client = AsyncOpenAI(
+                base_url=HF_BASE_URL,
+                api_key=HF_TOKEN,
+                timeout=LLM_TIMEOUT_SECONDS,
+                http_client=httpx.AsyncClient(
+                    http2=_HTTP2, limits=_hf_httpx_limits(), timeout=LLM_TIMEOUT_SECONDS
+                ),
+            )
+        _score_loop = asyncio.get_running_loop()
+        _score_queue = asyncio.Queue()
+        worker = asyncio.create_task(_scoring_worker())
+
+        # Optional: without it the first semantic-cache miss loads the model and its key's
+        # embeddings. Runs on a daemon thread so startup doesn't wait on a model download.
+        if SEMANTIC_CACHE_WARMUP:
+            threading.Thread(target=_warm_semantic_cache, name="embedder-warmup", daemon=True).start()
+
+    yield
+
+    if worker is not None:
+        worker.cancel()
+        with suppress(asyncio.CancelledError):
+            await worker
+    _score_queue = None
+    _score_loop = None
+
+    if _hf_async_client is not None:
+        await _hf_async_client.close()
+        _hf_async_client = None
+    if _hf_client is not None:
+        _hf_client.close()
+
+
+app = FastAPI(title="Social Battery Forecaster", lifespan=lifespan, default_response_class=FastJSONResponse)
 init_db()
 
 
@@ -177,29 +616,165 @@ app.add_middleware(
     https_only=True,
 )
 
+
+# Routes that call _require_user_id
+_AUTH_PATH_PREFIXES = ("/api/events", "/api/google/")
+
+_UNAUTHORIZED_BODY = b'{"detail":"Not authenticated"}'
+_UNAUTHORIZED_START = {
+    "type": "http.response.start",
+    "status": 401,
+    "headers": [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(_UNAUTHORIZED_BODY)).encode("latin-1")),
+    ],
+}
+_UNAUTHORIZED_BODY_MSG = {"type": "http.response.body", "body": _UNAUTHORIZED_BODY}
+
+
+class SessionFastPath:
+    """
+    Pure-ASGI auth check for the authenticated API routes.
+    Decodes the signed session cookie (same format as SessionMiddleware) straight into
+    scope["state"]["user"], and answers 401 itself when there is no signed-in user.
+    """
+
+    def __init__(self, app, secret_key: str, session_cookie: str = "session", max_age: int = 14 * 24 * 60 * 60):
+        self.app = app
+        self.signer = itsdangerous.TimestampSigner(str(secret_key))
+        self.session_cookie = session_cookie
+        self.max_age = max_age
+
+    def _session_user(self, scope) -> Optional[dict]:
+        for name, value in scope["headers"]:
+            if name != b"cookie":
+                continue
+            data = cookie_parser(value.decode("latin-1")).get(self.session_cookie)
+            if not data:
+                return None
+            try:
+                raw = self.signer.unsign(data.encode("utf-8"), max_age=self.max_age)
+                return json.loads(base64.b64decode(raw)).get("user")
+            except (itsdangerous.BadSignature, ValueError):
+                return None
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or not scope["path"].startswith(_AUTH_PATH_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        user = self._session_user(scope)
+        if not user or not user.get("sub"):
+            await send(_UNAUTHORIZED_START)
+            await send(_UNAUTHORIZED_BODY_MSG)
+            return
+
+        scope.setdefault("state", {})["user"] = user
+        await self.app(scope, receive, send)
+
+
+# Added after SessionMiddleware so it runs before it; CORS stays outermost
+app.add_middleware(SessionFastPath, secret_key=SESSION_SECRET)
+
+CORS_ORIGINS = (
+    "https://socialbatteryforecaster.xyz",
+    "https://www.socialbatteryforecaster.xyz",
+    "http://localhost:5173",
+)
+CORS_METHODS = ("GET", "POST", "PUT", "DELETE", "OPTIONS")
+CORS_HEADERS = ("Content-Type", "Authorization", "X-Requested-With", "Accept", "Origin")
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "https://socialbatteryforecaster.xyz",
-        "https://www.socialbatteryforecaster.xyz",
-        "http://localhost:5173",
-    ],
+    allow_origins=list(CORS_ORIGINS),
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=[
-        "Content-Type",
-        "Authorization",
-        "X-Requested-With",
-        "Accept",
-        "Origin",
-    ],
+    allow_methods=list(CORS_METHODS),
+    allow_headers=list(CORS_HEADERS),
 )
 
 
+class FastCORS:
+    """
+    Pure-ASGI answer for valid CORS preflights from the allowed origins.
+    Sends the same headers CORSMiddleware would; anything it can't approve outright
+    (unknown origin, method or header, private-network requests) falls through to
+    CORSMiddleware so rejections stay identical.
+    """
+
+    _SAFELISTED = ("Accept", "Accept-Language", "Content-Language", "Content-Type")
+
+    def __init__(self, app, origins=CORS_ORIGINS, methods=CORS_METHODS, headers=CORS_HEADERS):
+        self.app = app
+        self.origins = frozenset(o.encode("latin-1") for o in origins)
+        self.methods = frozenset(m.encode("latin-1") for m in methods)
+
+        allow_headers = sorted(set(self._SAFELISTED) | set(headers))
+        self.allow_headers = frozenset(h.lower() for h in allow_headers)
+        self.preflight_headers = [
+            (
+                b"vary",
+                b"Origin, Access-Control-Request-Method, Access-Control-Request-Headers, "
+                b"Access-Control-Request-Private-Network",
+            ),
+            (b"access-control-allow-methods", ", ".join(methods).encode("latin-1")),
+            (b"access-control-max-age", b"600"),
+            (b"access-control-allow-headers", ", ".join(allow_headers).encode("latin-1")),
+            (b"access-control-allow-credentials", b"true"),
+            (b"content-length", b"2"),
+            (b"content-type", b"text/plain; charset=utf-8"),
+        ]
+
+    def _preflight_origin(self, scope) -> Optional[bytes]:
+        origin = method = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                method = value
+            elif name == b"access-control-request-headers":
+                requested = value.decode("latin-1").lower().split(",")
+                if any(h.strip() not in self.allow_headers for h in requested):
+                    return None
+            elif name == b"access-control-request-private-network":
+                return None
+
+        if origin in self.origins and method in self.methods:
+            return origin
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        origin = self._preflight_origin(scope)
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"access-control-allow-origin", origin), *self.preflight_headers],
+            }
+        )
+        await send({"type": "http.response.body", "body": b"OK"})
+
+
+# Outermost: preflights are answered before the rest of the middleware stack
+app.add_middleware(FastCORS)
+
 
 # ------------------
 # DEBUG EXCEPTION HANDLER
 # ------------------
+# Stays async: it only formats the traceback, nothing here may block the event loop
 @app.exception_handler(Exception)
 async def debug_exception_handler(request: Request, exc: Exception):
     tb = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
@@ -227,6 +802,8 @@ def health():
         "hf_configured": bool(_hf_client),
         "hf_base_url": HF_BASE_URL if _hf_client else None,
         "hf_model": HF_MODEL if _hf_client else None,
+        "hf_circuit": _hf_breaker.status() if _hf_client else None,
+        "llm_truncations": _llm_truncations if _hf_client else None,
     }
 
 
@@ -239,13 +816,25 @@ def debug_cors():
 # HELPERS
 # ------------------
 def _require_user_id(request: Request) -> str:
-    user = request.session.get("user")
+    # Set by SessionFastPath; fall back to the full session for other routes
+    user = request.scope.get("state", {}).get("user") or request.session.get("user")
     if not user or not user.get("sub"):
         raise HTTPException(status_code=401, detail="Not authenticated")
     return user["sub"]
 
 
-def _parse_dt(dt_str: str) -> datetime:
+def _parse_timestamp(dt_str: str) -> datetime:
+    """
+    Uncached ISO-8601 parse; naive values are taken as UTC. Used directly for one-off
+    strings such as scored_at/updated_at, which would only churn _parse_dt's cache.
+    """
+    if ciso8601 is not None:
+        try:
+            dt = ciso8601.parse_datetime(dt_str)
+            return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+
     if dt_str.endswith("Z"):
         dt_str = dt_str.replace("Z", "+00:00")
     dt = datetime.fromisoformat(dt_str)
@@ -254,11 +843,24 @@ def _parse_dt(dt_str: str) -> datetime:
     return dt
 
 
+# Stored start/end strings come back on every /api/events read; datetimes are immutable,
+# so repeated parses of the same string can share one object. Event datetimes only.
+_parse_dt = lru_cache(maxsize=8192)(_parse_timestamp)
+
+
 def _to_utc_iso(dt_str: str) -> str:
     dt = _parse_dt(dt_str).astimezone(timezone.utc)
     return dt.isoformat()
 
 
+def _to_utc(dt_str: str) -> tuple:
+    """
+    (UTC datetime, its isoformat() string) from one parse.
+    """
+    dt = _parse_dt(dt_str).astimezone(timezone.utc)
+    return dt, dt.isoformat()
+
+
 def _row_has(row: sqlite3.Row, key: str) -> bool:
     try:
         return key in row.keys()
@@ -325,15 +927,52 @@ def _get_google_creds_from_session(request: Request) -> Optional[Credentials]:
     return creds
 
 
-def _event_datetime(evt: dict, key: str):
-    data = evt.get(key, {}) or {}
-    return data.get("dateTime"), data.get("date")
+def _event_datetime(evt: dict, key: str) -> tuple:
+    """
+    (datetime in the event's own offset, UTC isoformat() string) for a Google event's
+    start/end, parsed once; (None, None) for all-day events.
+    """
+    dt_str = (evt.get(key) or {}).get("dateTime")
+    if not dt_str:
+        return None, None
+    dt = _parse_dt(dt_str)
+    return dt, dt.astimezone(timezone.utc).isoformat()
 
 
-def _infer_event_type(attendee_count: int, summary: str, has_conference: bool) -> EventType:
-    s = (summary or "").lower()
+def _conference_flags(evt: dict) -> tuple:
+    """
+    (has_video, has_conference_link) for a Google event. Only a "video" entry point
+    (or a Meet hangoutLink) counts as video; phone/SIP-only conferences are links.
+    """
+    conf = evt.get("conferenceData") or {}
+    hangout = bool(evt.get("hangoutLink"))
+    has_video = hangout or any(
+        ep.get("entryPointType") == "video" for ep in conf.get("entryPoints") or ()
+    )
+    return has_video, bool(conf) or hangout
+
+
+# Plain substring match, like the old `any(x in s ...)`: "meeting" still counts via "meet"
+_CALL_KEYWORDS = re.compile("zoom|meet|video|call|teams")
+
+# Stored event_type string -> EventType, without going through Enum.__call__
+_EVENT_TYPE_BY_VALUE = {e.value: e for e in EventType}
 
-    if has_conference or any(x in s for x in ["zoom", "meet", "video", "call", "teams"]):
+
+def _event_type_of(value: Optional[str]) -> EventType:
+    # Unknown/missing types score as a meeting, the same default create_event_db stores
+    return _EVENT_TYPE_BY_VALUE.get(value, EventType.meeting)
+
+
+# Calendars are mostly recurring titles, so a sync page repeats the same few summaries;
+# caching the keyword check turns lower() + regex into one dict hit per event
+@lru_cache(maxsize=4096)
+def _is_call_title(summary: str) -> bool:
+    return _CALL_KEYWORDS.search(summary.lower()) is not None
+
+
+def _infer_event_type(attendee_count: int, summary: str, has_conference: bool) -> EventType:
+    if has_conference or _is_call_title(summary or ""):
         return EventType.call
 
     if attendee_count <= 0:
@@ -343,22 +982,28 @@ def _infer_event_type(attendee_count: int, summary: str, has_conference: bool) -
     return EventType.meeting
 
 
+# raw = sum of positive-keyed answers + sum of (6 - answer) for the rest
+#     = _PERSONALITY_OFFSET + _PERSONALITY_SIGNS . answers
+_POSITIVE_ITEMS = {1, 3, 5, 7, 8, 10, 12, 14, 15}
+_PERSONALITY_SIGNS = np.array([1 if i in _POSITIVE_ITEMS else -1 for i in range(1, 16)], dtype=np.int64)
+_PERSONALITY_OFFSET = sum(0 if i in _POSITIVE_ITEMS else 6 for i in range(1, 16))
+
+
 def compute_personality_profile(answers: list[int]) -> dict:
+    # Fresh dict per call: callers store it in the session
+    return {**_personality_profile(tuple(answers)), "modifiers": {}}
+
+
+@lru_cache(maxsize=4096)
+def _personality_profile(answers: tuple) -> dict:
     if len(answers) != 15:
         raise ValueError("Expected 15 answers")
 
-    for a in answers:
-        if not isinstance(a, int) or a < 1 or a > 5:
-            raise ValueError("Answers must be integers between 1 and 5")
-
-    positive = {1, 3, 5, 7, 8, 10, 12, 14, 15}
+    arr = np.asarray(answers)
+    if arr.dtype.kind not in "biu" or not np.all((arr >= 1) & (arr <= 5)):
+        raise ValueError("Answers must be integers between 1 and 5")
 
-    raw = 0
-    for i, ans in enumerate(answers, start=1):
-        if i in positive:
-            raw += ans
-        else:
-            raw += (6 - ans)
+    raw = _PERSONALITY_OFFSET + int(_PERSONALITY_SIGNS @ arr)
 
     personality_score = round(((raw - 15) / 60) * 100)
 
@@ -373,7 +1018,6 @@ def compute_personality_profile(answers: list[int]) -> dict:
         "personality_score": personality_score,
         "label": label,
         "raw_score": raw,
-        "modifiers": {},
     }
 
 
@@ -384,16 +1028,56 @@ _ALLOWED_LABELS = {"Low", "Medium", "High", "Extreme"}
 
 
 def _normalize_label(lbl: Any) -> str:
-    s = str(lbl or "").strip()
+    # ImpactLabel is a str Enum; str() on it would give "ImpactLabel.High"
+    s = str(getattr(lbl, "value", lbl) or "").strip()
     return s if s in _ALLOWED_LABELS else "Low"
 
 
-def _fallback_local_score(ne: NormalizedEvent, personality_score: int) -> dict:
-    s = score_event(ne, personality_score=personality_score).model_dump()
+@dataclass(slots=True, frozen=True)
+class _ScoreInput:
+    """
+    Scoring fields of a stored event row. Used instead of NormalizedEvent in the
+    per-row scoring loops (same attribute names, no Pydantic validation).
+    """
+
+    id: str
+    title: str
+    start: datetime
+    end: datetime
+    event_type: EventType
+    attendee_count: int
+    has_video: bool
+    has_conference_link: bool
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row, merged: dict) -> "_ScoreInput":
+        return cls(
+            id=row["id"],
+            title=row["title"],
+            start=_parse_dt(row["start"]),
+            end=_parse_dt(row["end"]),
+            event_type=_event_type_of(merged["event_type"]),
+            attendee_count=int(merged.get("attendee_count") or 0),
+            has_video=bool(merged.get("has_video")),
+            has_conference_link=bool(merged.get("has_conference_link")),
+        )
+
+
+# What the scoring helpers accept; both expose the same attribute names
+ScorableEvent = Union[NormalizedEvent, _ScoreInput]
+
+
+def _fallback_local_score(ne: ScorableEvent, personality_score: int) -> dict:
+    if isinstance(ne, NormalizedEvent):
+        raw = RawEvent.from_normalized(ne)
+    else:
+        raw = RawEvent.from_fields(ne.event_type, ne.start, ne.end, ne.has_video)
+    # make_scorer and the kernel behind it (_score_pure) are already memoized per input
+    s = make_scorer(personality_score)(raw)
     return {
-        "impact_score": float(s.get("impact_score", 0.0) or 0.0),
-        "impact_label": _normalize_label(s.get("impact_label", "Low")),
-        "reasons": s.get("reasons", []) or [],
+        "impact_score": float(s.impact_score or 0.0),
+        "impact_label": _normalize_label(s.impact_label),
+        "reasons": list(s.reasons or ()),
         "scoring_source": "local",
         "scoring_model": None,
     }
@@ -415,127 +1099,903 @@ def _extract_json_object(text: str) -> dict:
         raise ValueError(f"Could not find JSON object in: {s[:200]!r}")
 
     candidate = s[start : end + 1].strip()
-    return json.loads(candidate)
+    return _json_loads(candidate)
+
+
+def _stream_json_object(stream) -> tuple:
+    """
+    Collect streamed completion text until the first top-level JSON object closes,
+    then close the stream so the model stops generating and the connection is freed.
+    Braces inside JSON strings are ignored. Returns (text, finish_reason); finish_reason
+    is None when the object closed before the stream ended.
+    """
+    parts = []
+    depth = 0
+    in_string = escaped = False
+    finish_reason = None
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            finish_reason = getattr(chunk.choices[0], "finish_reason", None) or finish_reason
+            delta = chunk.choices[0].delta.content or ""
+            parts.append(delta)
+            for ch in delta:
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif ch == "\\":
+                        escaped = True
+                    elif ch == '"':
+                        in_string = False
+                elif ch == '"':
+                    in_string = depth > 0
+                elif ch == "{":
+                    depth += 1
+                elif ch == "}" and depth > 0:
+                    depth -= 1
+                    if depth == 0:
+                        return "".join(parts), None
+    finally:
+        stream.close()
+
+    return "".join(parts), finish_reason
+
+
+def _llm_stream_content(**kwargs) -> tuple:
+    return _stream_json_object(_hf_client.chat.completions.create(stream=True, **kwargs))
+
+
+# Completions cut off at max_tokens, counted apart from other LLM failures (see /health)
+_llm_truncations = 0
+_llm_truncations_lock = threading.Lock()
+
+
+def _log_llm_fallback(what: str, e: Exception):
+    global _llm_truncations
+    if isinstance(e, LLMTruncatedError):
+        with _llm_truncations_lock:
+            _llm_truncations += 1
+        print(f"{what} truncated (raise LLM_MAX_TOKENS_PER_EVENT); falling back to local:", repr(e))
+    else:
+        print(f"{what} failed; falling back to local:", repr(e))
+
+
+def _attendee_bucket(n: int) -> int:
+    # 0, 1, 2-3, 4-7, 8+
+    n = int(n or 0)
+    if n <= 1:
+        return max(0, n)
+    if n <= 3:
+        return 2
+    if n <= 7:
+        return 4
+    return 8
+
+
+def _duration_bucket(minutes: int) -> int:
+    # <=15, <=30, <=60, <=120, <=240, longer
+    for limit in (15, 30, 60, 120, 240):
+        if minutes <= limit:
+            return limit
+    return 480
+
+
+def _cache_features(ne: ScorableEvent, personality_score: int) -> dict:
+    duration_min = max(0, int((ne.end - ne.start).total_seconds() // 60))
+    return {
+        "event_type": ne.event_type.value,
+        "title": " ".join((ne.title or "").lower().split()),
+        "attendee_bucket": _attendee_bucket(ne.attendee_count),
+        "has_video": int(bool(ne.has_video)),
+        "has_conference_link": int(bool(ne.has_conference_link)),
+        # Exact minutes for the hash; the embedding fallback matches on the coarse bucket
+        "duration_min": duration_min,
+        "duration_bucket": _duration_bucket(duration_min),
+        "personality_score": int(personality_score),
+        "model": HF_MODEL,
+    }
+
+
+_FEATURE_KEYS = (
+    "event_type", "title", "attendee_bucket", "has_video", "has_conference_link",
+    "duration_min", "personality_score", "model",
+)
+
+
+def _feature_hash(features: dict) -> str:
+    # Fixed field order instead of json.dumps(sort_keys=True); 128-bit BLAKE2b is plenty
+    key = "|".join(str(features[k]) for k in _FEATURE_KEYS)
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
 
+# In-process copy of recent exact cache hits, in front of the scoring_cache table
+SCORE_MEMO_SIZE = 4096
+_score_memo: dict = {}
+_score_memo_lock = threading.Lock()
 
-def _llm_score_event(ne: NormalizedEvent, profile: dict) -> dict:
+
+def _score_memo_get(feature_hash: str) -> Optional[dict]:
+    score = _score_memo.get(feature_hash)
+    if score is None:
+        return None
+    return {**score, "reasons": list(score["reasons"])}
+
+
+def _score_memo_put(feature_hash: str, score: dict):
+    with _score_memo_lock:
+        if feature_hash not in _score_memo and len(_score_memo) >= SCORE_MEMO_SIZE:
+            # Oldest insert first (dicts keep insertion order)
+            del _score_memo[next(iter(_score_memo))]
+        _score_memo[feature_hash] = {**score, "reasons": tuple(score["reasons"])}
+
+
+_embedder = None
+_embedder_failed = False
+_embedder_lock = threading.Lock()
+
+
+def _load_embedder():
+    """
+    The SentenceTransformer, loaded once (it pulls in torch and may download the model);
+    None if sentence-transformers isn't available. Concurrent callers wait for one load.
+    """
+    global _embedder, _embedder_failed
+    if _embedder is not None or _embedder_failed:
+        return _embedder
+    with _embedder_lock:
+        if _embedder is None and not _embedder_failed:
+            try:
+                from sentence_transformers import SentenceTransformer
+
+                _embedder = SentenceTransformer(SEMANTIC_CACHE_MODEL)
+            except Exception as e:
+                print("Semantic cache disabled (no embedding model):", repr(e))
+                _embedder_failed = True
+    return _embedder
+
+
+def _embed_title(title: str) -> Optional[np.ndarray]:
+    """
+    Normalized float32 embedding of a title, or None if sentence-transformers isn't available.
+    """
+    embedder = _load_embedder()
+    if embedder is None:
+        return None
+    vec = embedder.encode([title], normalize_embeddings=True)[0]
+    return np.asarray(vec, dtype=np.float32)
+
+
+def _cache_row_to_score(row: sqlite3.Row) -> dict:
+    return {
+        "impact_score": float(row["impact_score"] or 0.0),
+        "impact_label": _normalize_label(row["impact_label"]),
+        "reasons": _json_loads(row["reasons_json"] or "[]"),
+        "scoring_source": "llm",
+        "scoring_model": row["model"],
+    }
+
+
+# In-process embedding index for the fallback: one float32 matrix per categorical key,
+# newest row first, capped at SEMANTIC_CACHE_MAX_ROWS. Filled from scoring_cache at warm-up
+# (or on a key's first miss) and extended by _score_cache_store, so a miss is one matrix
+# product instead of a scan that decodes every matching BLOB. Entries are replaced whole,
+# never mutated, so readers don't take the lock. Rows cached by other processes show up
+# after a restart.
+_EMBEDDING_KEYS = (
+    "event_type", "attendee_bucket", "duration_bucket", "has_video", "has_conference_link",
+    "personality_score", "model",
+)
+_embedding_index: dict = {}  # key tuple -> (float32 matrix, [score dict per row])
+_embedding_index_lock = threading.Lock()
+_embedding_index_complete = False  # every key with rows has been loaded
+
+_EMBEDDING_ROWS_SQL = """
+    SELECT embedding, impact_score, impact_label, reasons_json, model
+    FROM scoring_cache
+    WHERE event_type=? AND attendee_bucket=? AND duration_bucket=? AND has_video=?
+      AND has_conference_link=? AND personality_score=? AND model IS ?
+      AND embedding IS NOT NULL
+    ORDER BY created_at DESC
+    LIMIT ?
+"""
+
+_ALL_EMBEDDING_ROWS_SQL = """
+    SELECT event_type, attendee_bucket, duration_bucket, has_video, has_conference_link,
+           personality_score, model, embedding, impact_score, impact_label, reasons_json
+    FROM (
+        SELECT *, ROW_NUMBER() OVER (
+            PARTITION BY event_type, attendee_bucket, duration_bucket, has_video,
+                         has_conference_link, personality_score, model
+            ORDER BY created_at DESC
+        ) AS rn
+        FROM scoring_cache
+        WHERE embedding IS NOT NULL AND duration_bucket IS NOT NULL
+    )
+    WHERE rn <= ?
+    ORDER BY created_at DESC
+"""
+
+
+def _embedding_entry(rows: list) -> tuple:
+    if not rows:
+        return np.empty((0, 0), dtype=np.float32), []
+    mat = np.stack([np.frombuffer(r["embedding"], dtype=np.float32) for r in rows])
+    return mat, [_cache_row_to_score(r) for r in rows]
+
+
+def _embedding_index_get(key: tuple) -> tuple:
+    entry = _embedding_index.get(key)
+    if entry is not None or _embedding_index_complete:
+        return entry
+
+    with db.read() as conn:
+        rows = conn.execute(_EMBEDDING_ROWS_SQL, key + (SEMANTIC_CACHE_MAX_ROWS,)).fetchall()
+    entry = _embedding_entry(rows)
+    with _embedding_index_lock:
+        return _embedding_index.setdefault(key, entry)
+
+
+def _embedding_index_preload():
+    """
+    Load the newest SEMANTIC_CACHE_MAX_ROWS embeddings of every key in one query.
+    """
+    global _embedding_index_complete
+    with db.read() as conn:
+        rows = conn.execute(_ALL_EMBEDDING_ROWS_SQL, (SEMANTIC_CACHE_MAX_ROWS,)).fetchall()
+
+    by_key: dict = {}
+    for r in rows:
+        by_key.setdefault(tuple(r[k] for k in _EMBEDDING_KEYS), []).append(r)
+
+    with _embedding_index_lock:
+        for key, key_rows in by_key.items():
+            # Keys loaded or extended meanwhile are at least as fresh
+            _embedding_index.setdefault(key, _embedding_entry(key_rows))
+        _embedding_index_complete = True
+
+
+def _embedding_index_add(key: tuple, embedding: np.ndarray, score: dict):
+    with _embedding_index_lock:
+        entry = _embedding_index.get(key)
+        if entry is None and not _embedding_index_complete:
+            # Not loaded yet; the first lookup reads this row back from scoring_cache
+            return
+        if entry is None or not entry[1]:
+            mat, scores = embedding[None, :], [score]
+        else:
+            keep = SEMANTIC_CACHE_MAX_ROWS - 1
+            mat = np.concatenate((embedding[None, :], entry[0][:keep]))
+            scores = [score] + entry[1][:keep]
+        _embedding_index[key] = (mat, scores)
+
+
+def _warm_semantic_cache():
+    if _load_embedder() is None:
+        return
+    try:
+        _embedding_index_preload()
+    except Exception as e:
+        print("Semantic cache preload failed:", repr(e))
+
+
+def _score_cache_lookup(feature_hash: str, features: dict, embedding: Optional[np.ndarray]) -> Optional[dict]:
+    with db.read() as conn:
+        row = conn.execute(
+            "SELECT impact_score, impact_label, reasons_json, model FROM scoring_cache WHERE feature_hash=?",
+            (feature_hash,),
+        ).fetchone()
+    if row:
+        return _cache_row_to_score(row)
+
+    if embedding is None:
+        return None
+
+    # Nearest cached title among entries with identical categorical features
+    entry = _embedding_index_get(tuple(features[k] for k in _EMBEDDING_KEYS))
+    if entry is None or not entry[1]:
+        return None
+
+    mat, scores = entry
+    sims = mat @ embedding
+    best = int(np.argmax(sims))
+    if sims[best] >= SEMANTIC_CACHE_MIN_SIM:
+        score = scores[best]
+        return {**score, "reasons": list(score["reasons"])}
+    return None
+
+
+_SCORE_CACHE_INSERT_SQL = """
+    INSERT OR REPLACE INTO scoring_cache (
+        feature_hash, event_type, attendee_bucket, duration_bucket, has_video, has_conference_link,
+        personality_score, embedding, impact_score, impact_label, reasons_json, model, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _score_cache_store(
+    feature_hash: str,
+    features: dict,
+    embedding: Optional[np.ndarray],
+    score: dict,
+):
+    """
+    Memoize a fresh LLM score and write it to scoring_cache.
+    """
+    _score_memo_put(feature_hash, {**score, "scoring_source": "llm"})
+    params = (
+        feature_hash,
+        features["event_type"],
+        features["attendee_bucket"],
+        features["duration_bucket"],
+        features["has_video"],
+        features["has_conference_link"],
+        features["personality_score"],
+        embedding.tobytes() if embedding is not None else None,
+        float(score["impact_score"]),
+        score["impact_label"],
+        _json_dumps(score["reasons"]),
+        score.get("scoring_model"),
+        datetime.now(timezone.utc).isoformat(),
+    )
+    with db.write() as conn:
+        conn.execute(_SCORE_CACHE_INSERT_SQL, params)
+    if embedding is not None:
+        # Keyed like the row just written, whose model column is the scoring model
+        key = tuple(features[k] for k in _EMBEDDING_KEYS[:-1]) + (score.get("scoring_model"),)
+        cached = {
+            "impact_score": float(score["impact_score"]),
+            "impact_label": _normalize_label(score["impact_label"]),
+            "reasons": list(score["reasons"]),
+            "scoring_source": "llm",
+            "scoring_model": score.get("scoring_model"),
+        }
+        _embedding_index_add(key, embedding, cached)
+
+
+_CONTRACT_JSON = json.dumps(
+    {
+        "impact_score": "Signed float: negative = drain, positive = boost.",
+        "impact_label": "One of: Low, Medium, High, Extreme (intensity of |impact_score|).",
+        "reasons": "2-5 short strings.",
+    },
+    sort_keys=True,
+)
+
+# Static prompt prefix: byte-identical across calls so provider-side prompt caching can hit.
+# Carries the contract and the key legend, so each request only adds two short lines.
+_SYSTEM_PROMPT = (
+    "Return ONLY a JSON object (no markdown, no commentary, no code fences). "
+    "Schema:\n"
+    '{"impact_score": number, "impact_label": "Low"|"Medium"|"High"|"Extreme", "reasons": string[]}\n'
+    "Contract: " + _CONTRACT_JSON + "\n"
+    "Input is two lines of key=value pairs separated by ';'.\n"
+    "event: t=event type; n=attendees; v=video (0/1); c=conference link (0/1); "
+    "m=duration in minutes; title=rest of the line.\n"
+    "personality: s=score 0-100 (0 = introvert); label; mod=modifiers JSON.\n"
+    "If unsure, still output valid JSON."
+)
+
+
+def _llm_event_line(ne: ScorableEvent) -> str:
+    minutes = max(0, int((ne.end - ne.start).total_seconds() // 60))
+    # Title last, so a ';' or '=' inside it can't shift the other keys
+    title = " ".join((ne.title or "").split())
+    return (
+        f"t={ne.event_type.value};n={int(ne.attendee_count or 0)};v={int(bool(ne.has_video))};"
+        f"c={int(bool(ne.has_conference_link))};m={minutes};title={title}"
+    )
+
+
+def _llm_personality_line(personality: dict) -> str:
+    return (
+        f"s={personality['score']};label={personality['label']};"
+        f"mod={_json_dumps(personality['modifiers'])}"
+    )
+
+
+def _llm_user_message(ne: ScorableEvent, personality: dict) -> str:
+    return "event: " + _llm_event_line(ne) + "\npersonality: " + _llm_personality_line(personality)
+
+
+def _llm_extra_body() -> Optional[dict]:
+    return {"prompt_cache_key": LLM_PROMPT_CACHE_KEY} if LLM_PROMPT_CACHE_KEY else None
+
+
+def _llm_output_kwargs(n_events: int = 1) -> dict:
+    """
+    Completion limits shared by the single and batched calls: JSON-only output and a
+    token budget sized to the number of events, so the decode can't run on.
+    """
+    kwargs = {"max_tokens": LLM_MAX_TOKENS_PER_EVENT * n_events}
+    if LLM_JSON_MODE:
+        kwargs["response_format"] = {"type": "json_object"}
+    return kwargs
+
+
+def _llm_event_payload(ne: ScorableEvent) -> dict:
+    return {
+        "title": ne.title,
+        "start": ne.start.isoformat(),
+        "end": ne.end.isoformat(),
+        "event_type": ne.event_type.value,
+        "attendee_count": int(ne.attendee_count or 0),
+        "has_video": bool(ne.has_video),
+        "has_conference_link": bool(ne.has_conference_link),
+    }
+
+
+def _llm_personality_payload(profile: dict, personality_score: int) -> dict:
+    return {
+        "score": personality_score,
+        "label": profile.get("label", "Introvert"),
+        "modifiers": profile.get("modifiers", {}) or {},
+    }
+
+
+def _llm_result_to_score(data: dict) -> dict:
+    impact_score = float(data.get("impact_score", 0.0) or 0.0)
+    impact_label = _normalize_label(data.get("impact_label", "Low"))
+    reasons = data.get("reasons", []) or []
+    if not isinstance(reasons, list):
+        reasons = [str(reasons)]
+    reasons = [str(r) for r in reasons][:6]
+    if len(reasons) == 0:
+        reasons = ["No reasons returned"]
+
+    return {
+        "impact_score": impact_score,
+        "impact_label": impact_label,
+        "reasons": reasons,
+        "scoring_source": "llm",
+        "scoring_model": HF_MODEL,
+    }
+
+
+def _score_cache_get(ne: ScorableEvent, personality_score: int):
+    """
+    Semantic cache: exact feature match first (in-process memo, then SQLite), then
+    nearest title embedding.
+    Returns (cached score or None, features, feature_hash, embedding).
+    """
+    features = _cache_features(ne, personality_score)
+    feature_hash = _feature_hash(features)
+    embedding = None
+
+    cached = _score_memo_get(feature_hash)
+    if cached is not None:
+        return cached, features, feature_hash, embedding
+
+    try:
+        cached = _score_cache_lookup(feature_hash, features, None)
+        if cached is not None:
+            _score_memo_put(feature_hash, cached)
+        else:
+            embedding = _embed_title(features["title"])
+            if embedding is not None:
+                cached = _score_cache_lookup(feature_hash, features, embedding)
+    except Exception as e:
+        print("Score cache lookup failed:", repr(e))
+    return cached, features, feature_hash, embedding
+
+
+def _llm_score_event(ne: ScorableEvent, profile: dict) -> dict:
+    """
+    LLM score for one event (cache first, local fallback on failure).
+    """
     personality_score = int(profile.get("personality_score", 30) or 30)
 
     if not _hf_client:
         return _fallback_local_score(ne, personality_score)
 
-    payload = {
-        "event": {
-            "title": ne.title,
-            "start": ne.start.isoformat(),
-            "end": ne.end.isoformat(),
-            "event_type": ne.event_type.value,
-            "attendee_count": int(ne.attendee_count or 0),
-            "has_video": bool(ne.has_video),
-            "has_conference_link": bool(ne.has_conference_link),
-        },
-        "personality": {
-            "score": personality_score,
-            "label": profile.get("label", "Introvert"),
-            "modifiers": profile.get("modifiers", {}) or {},
-        },
-        "output_contract": {
-            "impact_score": "Signed float: negative = drain, positive = boost.",
-            "impact_label": "One of: Low, Medium, High, Extreme (intensity of |impact_score|).",
-            "reasons": "2-5 short strings.",
-        },
-    }
+    cached, features, feature_hash, embedding = _score_cache_get(ne, personality_score)
+    if cached is not None:
+        return cached
+
+    # HF is known to be failing: don't pay a timeout per event
+    if not _hf_breaker.allow():
+        return _fallback_local_score(ne, personality_score)
+
+    user_message = _llm_user_message(ne, _llm_personality_payload(profile, personality_score))
+
+    try:
+        # Streamed, and cut off as soon as the JSON object is complete
+        content, finish_reason = _hf_breaker.call(
+            _llm_stream_content,
+            model=HF_MODEL,
+            messages=[
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "user", "content": user_message},
+            ],
+            temperature=0.2,
+            extra_body=_llm_extra_body(),
+            **_llm_output_kwargs(),
+        )
+
+        # Not a provider failure, so raised outside the breaker
+        if finish_reason == "length":
+            raise LLMTruncatedError(f"stream stopped at max_tokens after {len(content)} chars")
+        if not content:
+            raise RuntimeError("No content returned from HF model")
+
+        score = _llm_result_to_score(_extract_json_object(content))
+        _score_cache_store(feature_hash, features, embedding, score)
+        return score
+    except Exception as e:
+        _log_llm_fallback("HF LLM scoring", e)
+        return _fallback_local_score(ne, personality_score)
+
+
+# ---- Batched LLM scoring (one chat completion per LLM_BATCH_SIZE events) ----
+_BATCH_SYSTEM_PROMPT = (
+    "Return ONLY a JSON object (no markdown, no commentary, no code fences). "
+    "Score every event in the input. Schema:\n"
+    '{"results": [{"id": string, "impact_score": number, '
+    '"impact_label": "Low"|"Medium"|"High"|"Extreme", "reasons": string[]}]}\n'
+    "Use each event's id exactly as given. If unsure, still output valid JSON."
+)
+
+
+def _llm_batch_user_message(events: list, personality: dict) -> str:
+    return (
+        '{"contract": ' + _CONTRACT_JSON
+        + ', "events": ' + _json_dumps(events)
+        + ', "personality": ' + _json_dumps(personality)
+        + "}"
+    )
+
+
+def _llm_chunk_request(chunk: list, personality: dict) -> dict:
+    events = [{"id": ne.id, **_llm_event_payload(ne)} for ne in chunk]
+    return {
+        "model": HF_MODEL,
+        "messages": [
+            {"role": "system", "content": _BATCH_SYSTEM_PROMPT},
+            {"role": "user", "content": _llm_batch_user_message(events, personality)},
+        ],
+        "temperature": 0.2,
+        "extra_body": _llm_extra_body(),
+        **_llm_output_kwargs(len(chunk)),
+    }
+
+
+def _llm_chunk_results(resp, chunk: list) -> dict:
+    """
+    Parse a batch completion into {event id: score}; events the model left out are
+    simply missing from the result.
+    """
+    choice = resp.choices[0] if resp and resp.choices else None
+    if choice is not None and getattr(choice, "finish_reason", None) == "length":
+        raise LLMTruncatedError(f"batch of {len(chunk)} events stopped at max_tokens")
+    content = choice.message.content if choice is not None else None
+    if not content:
+        raise RuntimeError("No content returned from HF model")
+
+    results = _extract_json_object(content).get("results")
+    if not isinstance(results, list):
+        raise ValueError("Batch response has no results array")
+
+    wanted = {ne.id for ne in chunk}
+    out = {}
+    for item in results:
+        if isinstance(item, dict) and str(item.get("id")) in wanted:
+            out[str(item["id"])] = _llm_result_to_score(item)
+    return out
+
+
+def _llm_score_chunk(chunk: list, personality: dict) -> dict:
+    """
+    Score up to LLM_BATCH_SIZE events in one completion. Returns {event id: score}.
+    """
+    resp = _hf_breaker.call(_hf_client.chat.completions.create, **_llm_chunk_request(chunk, personality))
+    return _llm_chunk_results(resp, chunk)
+
+
+async def _llm_score_chunk_async(chunk: list, personality: dict) -> dict:
+    resp = await _hf_breaker.acall(_hf_async_client.chat.completions.create, **_llm_chunk_request(chunk, personality))
+    return _llm_chunk_results(resp, chunk)
+
+
+def _llm_batch_pending(nes: list, personality_score: int):
+    """
+    Split events into cache hits and LLM_BATCH_SIZE chunks still to send.
+    Returns (scores with None holes, chunks of (index, ne, features, feature_hash, embedding)).
+    """
+    scores: list = [None] * len(nes)
+    pending = []
+    for i, ne in enumerate(nes):
+        cached, features, feature_hash, embedding = _score_cache_get(ne, personality_score)
+        if cached is not None:
+            scores[i] = cached
+        else:
+            pending.append((i, ne, features, feature_hash, embedding))
+
+    chunks = [pending[start : start + LLM_BATCH_SIZE] for start in range(0, len(pending), LLM_BATCH_SIZE)]
+    return scores, chunks
+
+
+def _llm_batch_fill(scores: list, chunk: list, by_id: dict, personality_score: int):
+    """
+    Put a chunk's LLM scores (or local fallbacks for missing ones) into `scores` and cache them.
+    """
+    for i, ne, features, feature_hash, embedding in chunk:
+        score = by_id.get(ne.id)
+        if score is None:
+            scores[i] = _fallback_local_score(ne, personality_score)
+            continue
+        try:
+            _score_cache_store(feature_hash, features, embedding, score)
+        except Exception as e:
+            print("Score cache store failed:", repr(e))
+        scores[i] = score
+
+
+def _llm_score_events_batch(nes: list, profile: dict) -> list:
+    """
+    Batch version of _llm_score_event: returns one score dict per event, in input order.
+    Cache hits skip the LLM; the rest go out LLM_BATCH_SIZE events per request, and any
+    event that can't be parsed out of the response is scored locally.
+    """
+    personality_score = int(profile.get("personality_score", 30) or 30)
+
+    if not _hf_client:
+        return [_fallback_local_score(ne, personality_score) for ne in nes]
+
+    scores, chunks = _llm_batch_pending(nes, personality_score)
+
+    personality = _llm_personality_payload(profile, personality_score)
+    for chunk in chunks:
+        try:
+            by_id = _llm_score_chunk([p[1] for p in chunk], personality)
+        except CircuitOpenError:
+            by_id = {}
+        except Exception as e:
+            _log_llm_fallback("HF LLM batch scoring", e)
+            by_id = {}
+        _llm_batch_fill(scores, chunk, by_id, personality_score)
+
+    return scores
+
 
-    system = (
-        "Return ONLY a JSON object (no markdown, no commentary, no code fences). "
-        "Schema:\n"
-        '{"impact_score": number, "impact_label": "Low"|"Medium"|"High"|"Extreme", "reasons": string[]}\n'
-        "If unsure, still output valid JSON."
-    )
+async def _llm_score_events_batch_async(nes: list, profile: dict) -> list:
+    """
+    _llm_score_events_batch on the async client: all chunks are in flight at once
+    (multiplexed on one connection with HTTP/2). DB work runs in the threadpool.
+    """
+    personality_score = int(profile.get("personality_score", 30) or 30)
 
-    try:
-        client = _hf_client
-        if hasattr(client, "with_options"):
-            client = client.with_options(timeout=LLM_TIMEOUT_SECONDS)
+    scores, chunks = await anyio.to_thread.run_sync(_llm_batch_pending, nes, personality_score)
 
-        resp = client.chat.completions.create(
-            model=HF_MODEL,
-            messages=[
-                {"role": "system", "content": system},
-                {"role": "user", "content": json.dumps(payload)},
-            ],
-            temperature=0.2,
-        )
+    personality = _llm_personality_payload(profile, personality_score)
 
-        content = resp.choices[0].message.content if resp and resp.choices else None
-        if not content:
-            raise RuntimeError("No content returned from HF model")
+    async def score_chunk(chunk):
+        try:
+            return await _llm_score_chunk_async([p[1] for p in chunk], personality)
+        except CircuitOpenError:
+            return {}
+        except Exception as e:
+            _log_llm_fallback("HF LLM batch scoring", e)
+            return {}
 
-        data = _extract_json_object(content)
+    results = await asyncio.gather(*(score_chunk(chunk) for chunk in chunks))
 
-        impact_score = float(data.get("impact_score", 0.0) or 0.0)
-        impact_label = _normalize_label(data.get("impact_label", "Low"))
-        reasons = data.get("reasons", []) or []
-        if not isinstance(reasons, list):
-            reasons = [str(reasons)]
-        reasons = [str(r) for r in reasons][:6]
-        if len(reasons) == 0:
-            reasons = ["No reasons returned"]
+    def fill():
+        for chunk, by_id in zip(chunks, results):
+            _llm_batch_fill(scores, chunk, by_id, personality_score)
 
-        return {
-            "impact_score": impact_score,
-            "impact_label": impact_label,
-            "reasons": reasons,
-            "scoring_source": "llm",
-            "scoring_model": HF_MODEL,
-        }
-    except Exception as e:
-        print("HF LLM scoring failed; falling back to local:", repr(e))
-        return _fallback_local_score(ne, personality_score)
+    await anyio.to_thread.run_sync(fill)
+    return scores
 
 
 def _needs_rescore(row: sqlite3.Row) -> bool:
     if _row_get(row, "scored_at") is None:
         return True
     try:
-        scored_dt = _parse_dt(row["scored_at"])
-        updated_dt = _parse_dt(row["updated_at"])
+        scored_dt = _parse_timestamp(row["scored_at"])
+        updated_dt = _parse_timestamp(row["updated_at"])
         return updated_dt > scored_dt
     except Exception:
         return True
 
 
-def _persist_score(conn: sqlite3.Connection, event_id: str, user_id: str, score: dict):
+_PERSIST_SCORE_SQL = """
+    UPDATE events
+    SET impact_score=?,
+        impact_label=?,
+        reasons_json=?,
+        scored_at=?,
+        scoring_source=?,
+        scoring_model=?
+    WHERE id=? AND user_id=?
+"""
+
+
+def _persist_score_params(event_id: str, user_id: str, score: dict, now_iso: str) -> tuple:
+    return (
+        float(score.get("impact_score", 0.0) or 0.0),
+        _normalize_label(score.get("impact_label", "Low")),
+        _json_dumps(score.get("reasons", []) or []),
+        now_iso,
+        score.get("scoring_source"),
+        score.get("scoring_model"),
+        event_id,
+        user_id,
+    )
+
+
+def _persist_scores(conn: sqlite3.Connection, user_id: str, scored: list):
+    """
+    Persist many (event_id, score) pairs with one executemany; the caller commits.
+    """
+    if not scored:
+        return
     now_iso = datetime.now(timezone.utc).isoformat()
-    conn.execute(
-        """
-        UPDATE events
-        SET impact_score=?,
-            impact_label=?,
-            reasons_json=?,
-            scored_at=?,
-            scoring_source=?,
-            scoring_model=?
-        WHERE id=? AND user_id=?
-        """,
-        (
-            float(score.get("impact_score", 0.0) or 0.0),
-            _normalize_label(score.get("impact_label", "Low")),
-            json.dumps(score.get("reasons", []) or []),
-            now_iso,
-            score.get("scoring_source"),
-            score.get("scoring_model"),
-            event_id,
-            user_id,
-        ),
+    conn.executemany(
+        _PERSIST_SCORE_SQL,
+        [_persist_score_params(event_id, user_id, score, now_iso) for event_id, score in scored],
     )
 
 
+def _persist_score(conn: sqlite3.Connection, event_id: str, user_id: str, score: dict):
+    _persist_scores(conn, user_id, [(event_id, score)])
+
+
+# Background scores are computed from a snapshot of the row; they only land if the row
+# still has the updated_at it was queued with. "= NULL" never matches, so rows queued
+# without an updated_at go through _PERSIST_SCORE_SQL instead.
+_PERSIST_SCORE_IF_CURRENT_SQL = _PERSIST_SCORE_SQL + "      AND updated_at = ?\n"
+
+
+# ---- Background LLM scoring ----
+# Requests enqueue (user_id, ne, profile, updated_at) from the threadpool; one asyncio worker
+# drains the queue in batches, persists the scores and pushes them to the user's SSE streams.
+_score_queue: Optional[asyncio.Queue] = None
+_score_loop: Optional[asyncio.AbstractEventLoop] = None
+_score_inflight: set = set()  # _score_key of every item queued or being scored
+_score_inflight_lock = threading.Lock()
+_score_subscribers: dict = {}  # user_id -> set of asyncio.Queue, one per open stream
+
+
+def _background_scoring_enabled() -> bool:
+    return _score_queue is not None
+
+
+def _score_key(user_id: str, event_id: str, profile: dict, updated_at: Optional[str]) -> tuple:
+    """
+    (user_id, personality_score, event_id, updated_at); the first two pick the LLM batch.
+    """
+    return user_id, int(profile.get("personality_score", 30) or 30), event_id, updated_at
+
+
+def _enqueue_scoring(user_id: str, ne: ScorableEvent, profile: dict, updated_at: Optional[str]):
+    """
+    Thread-safe, non-blocking; an event version already queued or being scored for the same
+    personality isn't queued again, so repeated GETs don't pile up the same work. updated_at
+    is the row version ne was read from; the score is dropped if the row has changed by the
+    time it is persisted, and the newer version can be queued meanwhile.
+    """
+    key = _score_key(user_id, ne.id, profile, updated_at)
+    with _score_inflight_lock:
+        if key in _score_inflight:
+            return
+        _score_inflight.add(key)
+    _score_loop.call_soon_threadsafe(_score_queue.put_nowait, (user_id, ne, profile, updated_at))
+
+
+def _persist_scores_db(results: list) -> list:
+    """
+    Persist [(user_id, [(event_id, updated_at, score), ...]), ...] with one executemany in
+    one transaction. Returns [(user_id, [(event_id, score), ...]), ...] for the rows written;
+    scores for rows changed since they were queued are dropped.
+    """
+    now_iso = datetime.now(timezone.utc).isoformat()
+    guarded, unguarded = [], []
+    for user_id, scored in results:
+        for event_id, updated_at, score in scored:
+            params = _persist_score_params(event_id, user_id, score, now_iso)
+            if updated_at is None:
+                unguarded.append(params)
+            else:
+                guarded.append(params + (updated_at,))
+    with db.write() as conn:
+        written_rows = 0
+        if unguarded:
+            written_rows += conn.executemany(_PERSIST_SCORE_SQL, unguarded).rowcount
+        if guarded:
+            written_rows += conn.executemany(_PERSIST_SCORE_IF_CURRENT_SQL, guarded).rowcount
+        if written_rows == len(guarded) + len(unguarded):
+            return [(user_id, [(e, score) for e, _, score in scored]) for user_id, scored in results]
+
+        # Some rows moved on (edited, re-synced or overridden); only report the ones written
+        written = []
+        for user_id, scored in results:
+            kept = [
+                (event_id, score)
+                for event_id, updated_at, score in scored
+                if conn.execute(
+                    "SELECT 1 FROM events WHERE id = ? AND user_id = ? AND scored_at = ?",
+                    (event_id, user_id, now_iso),
+                ).fetchone()
+            ]
+            if kept:
+                written.append((user_id, kept))
+        return written
+
+
+def _publish_scores(user_id: str, scored: list):
+    for q in _score_subscribers.get(user_id, ()):
+        for event_id, score in scored:
+            q.put_nowait(
+                {
+                    "id": event_id,
+                    "impact_score": float(score.get("impact_score", 0.0) or 0.0),
+                    "impact_label": _normalize_label(score.get("impact_label", "Low")),
+                    "reasons": score.get("reasons", []) or [],
+                    "scoring_status": "scored",
+                }
+            )
+
+
+async def _scoring_worker():
+    while True:
+        batch = [await _score_queue.get()]
+        try:
+            while len(batch) < LLM_BATCH_SIZE:
+                batch.append(await asyncio.wait_for(_score_queue.get(), timeout=SCORING_COALESCE_SECONDS))
+        except asyncio.TimeoutError:
+            pass
+
+        # One LLM batch per user and personality score, since the prompt carries both; a
+        # profile change mid-queue must not score the older items with the newer profile
+        by_profile: dict = {}
+        for user_id, ne, profile, updated_at in batch:
+            key = _score_key(user_id, ne.id, profile, updated_at)[:2]
+            by_profile.setdefault(key, (profile, []))[1].append((ne, updated_at))
+
+        results = await asyncio.gather(
+            *(
+                _score_user_batch(user_id, profile, items)
+                for (user_id, _), (profile, items) in by_profile.items()
+            )
+        )
+
+        # Every user's scores from this batch go out in a single write transaction
+        results = [(user_id, scored) for user_id, scored in results if scored]
+        try:
+            if results:
+                written = await anyio.to_thread.run_sync(_persist_scores_db, results)
+                for user_id, scored in written:
+                    _publish_scores(user_id, scored)
+        except Exception as e:
+            print("Background scoring failed:", repr(e))
+        finally:
+            with _score_inflight_lock:
+                for user_id, ne, profile, updated_at in batch:
+                    _score_inflight.discard(_score_key(user_id, ne.id, profile, updated_at))
+
+
+async def _score_user_batch(user_id: str, profile: dict, items: list) -> tuple:
+    """
+    (user_id, [(event_id, updated_at, score), ...]) for [(ne, updated_at), ...]; the score
+    list is empty if scoring failed.
+    """
+    nes = [ne for ne, _ in items]
+    try:
+        if _hf_async_client is not None:
+            scores = await _llm_score_events_batch_async(nes, profile)
+        else:
+            scores = await anyio.to_thread.run_sync(_llm_score_events_batch, nes, profile)
+        return user_id, [(ne.id, updated_at, score) for (ne, updated_at), score in zip(items, scores)]
+    except Exception as e:
+        print("Background scoring failed:", repr(e))
+        return user_id, []
+
+
 def _read_score_from_row(row: sqlite3.Row) -> Optional[dict]:
     if _row_get(row, "impact_score") is None or _row_get(row, "impact_label") is None:
         return None
     try:
-        reasons = json.loads(_row_get(row, "reasons_json") or "[]")
+        reasons = _json_loads(_row_get(row, "reasons_json") or "[]")
         if not isinstance(reasons, list):
             reasons = [str(reasons)]
         return {
@@ -595,12 +2055,11 @@ def auth_callback(request: Request):
         "name": idinfo.get("name"),
     }
 
-    conn = get_db()
-    row = conn.execute(
-        "SELECT personality_score, label, raw_score FROM user_profile WHERE user_id = ?",
-        (idinfo.get("sub"),),
-    ).fetchone()
-    conn.close()
+    with db.read() as conn:
+        row = conn.execute(
+            "SELECT personality_score, label, raw_score FROM user_profile WHERE user_id = ?",
+            (idinfo.get("sub"),),
+        ).fetchone()
 
     if row:
         request.session["profile"] = {
@@ -663,10 +2122,8 @@ def api_onboarding(request: Request, payload: dict = Body(...)):
     if answers == []:
         request.session.pop("profile", None)
         user_id = request.session["user"]["sub"]
-        conn = get_db()
-        conn.execute("DELETE FROM user_profile WHERE user_id = ?", (user_id,))
-        conn.commit()
-        conn.close()
+        with db.write() as conn:
+            conn.execute("DELETE FROM user_profile WHERE user_id = ?", (user_id,))
         return {"cleared": True}
 
     if not isinstance(answers, list):
@@ -680,59 +2137,98 @@ def api_onboarding(request: Request, payload: dict = Body(...)):
     request.session["profile"] = profile
 
     user_id = request.session["user"]["sub"]
-    conn = get_db()
-    conn.execute(
-        """
-        INSERT INTO user_profile (user_id, personality_score, label, raw_score)
-        VALUES (?, ?, ?, ?)
-        ON CONFLICT(user_id) DO UPDATE SET
-            personality_score=excluded.personality_score,
-            label=excluded.label,
-            raw_score=excluded.raw_score
-        """,
-        (user_id, profile["personality_score"], profile["label"], profile["raw_score"]),
-    )
-    conn.commit()
-    conn.close()
+    with db.write() as conn:
+        conn.execute(
+            """
+            INSERT INTO user_profile (user_id, personality_score, label, raw_score)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET
+                personality_score=excluded.personality_score,
+                label=excluded.label,
+                raw_score=excluded.raw_score
+            """,
+            (user_id, profile["personality_score"], profile["label"], profile["raw_score"]),
+        )
     return profile
 
 
 # ------------------
 # DB-BACKED EVENTS (MAIN API)
 # ------------------
-def _merged_event_row(conn: sqlite3.Connection, user_id: str, row: sqlite3.Row) -> dict:
+def _apply_overrides(base: dict, event_type, attendee_count, has_video, has_conference_link) -> dict:
+    # Only override when a column is non-null in overrides
+    if event_type is not None:
+        base["event_type"] = event_type
+    if attendee_count is not None:
+        base["attendee_count"] = int(attendee_count or 0)
+    if has_video is not None:
+        base["has_video"] = bool(has_video)
+    if has_conference_link is not None:
+        base["has_conference_link"] = bool(has_conference_link)
+
+    return base
+
+
+# Only the events columns _row_to_eventdict, _read_score_from_row and _needs_rescore read
+_EVENT_COLUMNS = (
+    "id", "title", "start", "end", "event_type", "attendee_count", "has_video",
+    "has_conference_link", "source", "updated_at", "impact_score", "impact_label",
+    "reasons_json", "scored_at",
+)
+
+_EVENT_BY_ID_SQL = f"SELECT {', '.join(_EVENT_COLUMNS)} FROM events WHERE id = ? AND user_id = ?"
+
+# Events with their google_overrides (if any) joined in as ov_* columns
+_EVENTS_JOINED_SELECT = f"""
+    SELECT {', '.join('e.' + c for c in _EVENT_COLUMNS)},
+           ov.event_id AS ov_event_id,
+           ov.event_type AS ov_event_type,
+           ov.attendee_count AS ov_attendee_count,
+           ov.has_video AS ov_has_video,
+           ov.has_conference_link AS ov_has_conference_link
+    FROM events e
+    LEFT JOIN google_overrides ov ON ov.user_id = e.user_id AND ov.event_id = e.id
+"""
+
+_EVENTS_WINDOW_SQL = _EVENTS_JOINED_SELECT + """
+    WHERE e.user_id = ?
+      AND e.start < ?
+      AND e.end > ?
+    ORDER BY e.start ASC
+"""
+
+# Same window, only rows without a current score (SQL version of _needs_rescore).
+# Both timestamps are written as UTC isoformat(), so they compare as strings.
+_EVENTS_TO_SCORE_SQL = _EVENTS_JOINED_SELECT + """
+    WHERE e.user_id = ?
+      AND e.start < ?
+      AND e.end > ?
+      AND (e.scored_at IS NULL OR e.updated_at > e.scored_at
+           OR e.impact_score IS NULL OR e.impact_label IS NULL)
+    ORDER BY e.start ASC
+"""
+
+_EVENT_JOINED_BY_ID_SQL = _EVENTS_JOINED_SELECT + "WHERE e.id = ? AND e.user_id = ?"
+
+
+def _merged_joined_row(row: sqlite3.Row) -> dict:
     """
-    Merge google_overrides (if any) on top of the stored google event row.
-    For local events, returns the row as-is.
+    Event dict with google_overrides (if any) merged on top, for rows from the
+    _EVENTS_JOINED_SELECT queries. Local events, and the many google events without
+    an override row (ov_event_id is NULL from the LEFT JOIN), are returned as-is.
     """
     base = _row_to_eventdict(row)
 
-    if base.get("source") != "google":
-        return base
-
-    ov = conn.execute(
-        """
-        SELECT event_type, attendee_count, has_video, has_conference_link
-        FROM google_overrides
-        WHERE user_id=? AND event_id=?
-        """,
-        (user_id, row["id"]),
-    ).fetchone()
-
-    if not ov:
+    if row["ov_event_id"] is None or base["source"] != "google":
         return base
 
-    # Only override when a column is non-null in overrides
-    if ov["event_type"] is not None:
-        base["event_type"] = ov["event_type"]
-    if ov["attendee_count"] is not None:
-        base["attendee_count"] = int(ov["attendee_count"] or 0)
-    if ov["has_video"] is not None:
-        base["has_video"] = bool(ov["has_video"])
-    if ov["has_conference_link"] is not None:
-        base["has_conference_link"] = bool(ov["has_conference_link"])
-
-    return base
+    return _apply_overrides(
+        base,
+        row["ov_event_type"],
+        row["ov_attendee_count"],
+        row["ov_has_video"],
+        row["ov_has_conference_link"],
+    )
 
 
 @app.get("/api/events")
@@ -743,51 +2239,87 @@ def get_events_db(request: Request, hours: int = 24):
     time_min = now.isoformat()
     time_max = (now + timedelta(hours=hours)).isoformat()
 
-    conn = get_db()
-    rows = conn.execute(
-        """
-        SELECT * FROM events
-        WHERE user_id = ?
-          AND start < ?
-          AND end > ?
-        ORDER BY start ASC
-        """,
-        (user_id, time_max, time_min),
-    ).fetchall()
-
     profile = request.session.get("profile") or {}
 
-    out = []
-    for r in rows:
-        merged = _merged_event_row(conn, user_id, r)
-
-        cached = _read_score_from_row(r)
-        if cached is None or _needs_rescore(r):
-            ne = NormalizedEvent(
-                id=r["id"],
-                title=r["title"],
-                start=_parse_dt(r["start"]),
-                end=_parse_dt(r["end"]),
-                event_type=EventType(merged["event_type"]),
-                attendee_count=int(merged.get("attendee_count") or 0),
-                has_video=bool(merged.get("has_video")),
-                has_conference_link=bool(merged.get("has_conference_link")),
-            )
-            score = _llm_score_event(ne, profile)
-            _persist_score(conn, r["id"], user_id, score)
-            cached = {
+    with db.read() as conn:
+        rows = conn.execute(_EVENTS_WINDOW_SQL, (user_id, time_max, time_min)).fetchall()
+
+        out = []
+        to_score = []  # (index into out, ne, row updated_at)
+        for r in rows:
+            merged = _merged_joined_row(r)
+
+            cached = _read_score_from_row(r)
+            if cached is None or _needs_rescore(r):
+                to_score.append((len(out), _ScoreInput.from_row(r, merged), r["updated_at"]))
+                out.append(merged)
+                continue
+
+            out.append({**merged, **cached, "scoring_status": "scored"})
+
+    if to_score and _background_scoring_enabled():
+        # Answer now with a provisional local score; the LLM score arrives via /api/events/stream
+        personality_score = int(profile.get("personality_score", 30) or 30)
+        for i, ne, updated_at in to_score:
+            local = _fallback_local_score(ne, personality_score)
+            out[i] = {
+                **out[i],
+                "impact_score": local["impact_score"],
+                "impact_label": local["impact_label"],
+                "reasons": local["reasons"],
+                "scoring_status": "pending",
+            }
+            _enqueue_scoring(user_id, ne, profile, updated_at)
+    elif to_score:
+        scores = _llm_score_events_batch([ne for _, ne, _ in to_score], profile)
+        with db.write() as conn:
+            _persist_scores(conn, user_id, [(ne.id, score) for (_, ne, _), score in zip(to_score, scores)])
+        for (i, _, _), score in zip(to_score, scores):
+            out[i] = {
+                **out[i],
                 "impact_score": float(score.get("impact_score", 0.0) or 0.0),
                 "impact_label": _normalize_label(score.get("impact_label", "Low")),
                 "reasons": score.get("reasons", []) or [],
+                "scoring_status": "scored",
             }
 
-        out.append({**merged, **cached})
-
-    conn.commit()
-    conn.close()
     return {"count": len(out), "window_hours": hours, "events": out}
 
 
+@app.get("/api/events/stream")
+async def stream_event_scores(request: Request):
+    """
+    Server-sent events: one `data:` message per event the background worker scores
+    for this user.
+    """
+    user_id = _require_user_id(request)
+
+    q: asyncio.Queue = asyncio.Queue()
+    _score_subscribers.setdefault(user_id, set()).add(q)
+
+    async def stream():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    item = await asyncio.wait_for(q.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {_json_dumps(item)}\n\n"
+        finally:
+            subs = _score_subscribers.get(user_id)
+            if subs is not None:
+                subs.discard(q)
+                if not subs:
+                    _score_subscribers.pop(user_id, None)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.post("/api/events")
 def create_event_db(request: Request, payload: dict = Body(...)):
     user_id = _require_user_id(request)
@@ -798,8 +2330,8 @@ def create_event_db(request: Request, payload: dict = Body(...)):
     if not start or not end:
         return JSONResponse({"error": "start and end are required (ISO datetime strings)"}, status_code=400)
 
-    start_iso = _to_utc_iso(start)
-    end_iso = _to_utc_iso(end)
+    start_dt, start_iso = _to_utc(start)
+    end_dt, end_iso = _to_utc(end)
 
     event_type = payload.get("event_type") or "meeting"
     attendee_count = int(payload.get("attendee_count") or 0)
@@ -809,52 +2341,63 @@ def create_event_db(request: Request, payload: dict = Body(...)):
     event_id = payload.get("id") or f"local_{uuid4().hex}"
     now_iso = datetime.now(timezone.utc).isoformat()
 
-    conn = get_db()
-    conn.execute(
-        """
-        INSERT INTO events (
-            id, user_id, source, title, start, end, event_type,
-            attendee_count, has_video, has_conference_link, modifiers_json, updated_at
-        ) VALUES (?, ?, 'local', ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            event_id,
-            user_id,
-            title,
-            start_iso,
-            end_iso,
-            event_type,
-            attendee_count,
-            int(has_video),
-            int(has_conference_link),
-            json.dumps(payload.get("modifiers")) if payload.get("modifiers") is not None else None,
-            now_iso,
-        ),
-    )
-    conn.commit()
-    row = conn.execute("SELECT * FROM events WHERE id = ? AND user_id = ?", (event_id, user_id)).fetchone()
-
     profile = request.session.get("profile") or {}
 
+    # Score from the request fields first, so the insert and the score share one transaction
     ne = NormalizedEvent(
-        id=row["id"],
-        title=row["title"],
-        start=_parse_dt(row["start"]),
-        end=_parse_dt(row["end"]),
-        event_type=EventType(row["event_type"]),
-        attendee_count=int(row["attendee_count"] or 0),
-        has_video=bool(row["has_video"]),
-        has_conference_link=bool(row["has_conference_link"]),
+        id=event_id,
+        title=title,
+        start=start_dt,
+        end=end_dt,
+        event_type=_event_type_of(event_type),
+        attendee_count=attendee_count,
+        has_video=has_video,
+        has_conference_link=has_conference_link,
     )
 
     score = _llm_score_event(ne, profile)
-    _persist_score(conn, row["id"], user_id, score)
-    conn.commit()
-    conn.close()
+
+    with db.write() as conn:
+        conn.execute(
+            """
+            INSERT INTO events (
+                id, user_id, source, title, start, end, event_type,
+                attendee_count, has_video, has_conference_link, modifiers_json, updated_at
+            ) VALUES (?, ?, 'local', ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                event_id,
+                user_id,
+                title,
+                start_iso,
+                end_iso,
+                event_type,
+                attendee_count,
+                int(has_video),
+                int(has_conference_link),
+                _json_dumps(payload.get("modifiers")) if payload.get("modifiers") is not None else None,
+                now_iso,
+            ),
+        )
+        _persist_score(conn, event_id, user_id, score)
+
+    # Everything the response needs is already in hand; no need to read the row back
+    base = {
+        "id": event_id,
+        "title": title,
+        "start": start_iso,
+        "end": end_iso,
+        "location": None,
+        "event_type": event_type,
+        "attendee_count": attendee_count,
+        "has_video": has_video,
+        "has_conference_link": has_conference_link,
+        "source": "local",
+    }
 
     return {
         "event": {
-            **_row_to_eventdict(row),
+            **base,
             "impact_score": float(score.get("impact_score", 0.0) or 0.0),
             "impact_label": _normalize_label(score.get("impact_label", "Low")),
             "reasons": score.get("reasons", []) or [],
@@ -866,14 +2409,10 @@ def create_event_db(request: Request, payload: dict = Body(...)):
 def update_event_db(event_id: str, request: Request, payload: dict = Body(...)):
     user_id = _require_user_id(request)
 
-    conn = get_db()
-    row = conn.execute(
-        "SELECT * FROM events WHERE id = ? AND user_id = ?",
-        (event_id, user_id),
-    ).fetchone()
+    with db.read() as conn:
+        row = conn.execute(_EVENT_BY_ID_SQL, (event_id, user_id)).fetchone()
 
     if not row:
-        conn.close()
         return JSONResponse({"error": "Event not found"}, status_code=404)
 
     title = payload.get("title", row["title"])
@@ -890,53 +2429,64 @@ def update_event_db(event_id: str, request: Request, payload: dict = Body(...)):
 
     now_iso = datetime.now(timezone.utc).isoformat()
 
-    conn.execute(
-        """
-        UPDATE events
-        SET title=?, start=?, end=?, event_type=?, attendee_count=?,
-            has_video=?, has_conference_link=?, updated_at=?,
-            scored_at=NULL, impact_score=NULL, impact_label=NULL, reasons_json=NULL,
-            scoring_source=NULL, scoring_model=NULL
-        WHERE id=? AND user_id=?
-        """,
-        (
-            title,
-            start_iso,
-            end_iso,
-            event_type,
-            attendee_count,
-            has_video,
-            has_conference_link,
-            now_iso,
-            event_id,
-            user_id,
-        ),
-    )
-    conn.commit()
-
-    row2 = conn.execute("SELECT * FROM events WHERE id = ? AND user_id = ?", (event_id, user_id)).fetchone()
-
     profile = request.session.get("profile") or {}
 
+    # Score the updated fields first, so the update and the score share one transaction
     ne = NormalizedEvent(
-        id=row2["id"],
-        title=row2["title"],
-        start=_parse_dt(row2["start"]),
-        end=_parse_dt(row2["end"]),
-        event_type=EventType(row2["event_type"]),
-        attendee_count=int(row2["attendee_count"] or 0),
-        has_video=bool(row2["has_video"]),
-        has_conference_link=bool(row2["has_conference_link"]),
+        id=event_id,
+        title=title,
+        start=_parse_dt(start_iso),
+        end=_parse_dt(end_iso),
+        event_type=_event_type_of(event_type),
+        attendee_count=attendee_count,
+        has_video=bool(has_video),
+        has_conference_link=bool(has_conference_link),
     )
 
     score = _llm_score_event(ne, profile)
-    _persist_score(conn, row2["id"], user_id, score)
-    conn.commit()
-    conn.close()
+
+    with db.write() as conn:
+        cur = conn.execute(
+            """
+            UPDATE events
+            SET title=?, start=?, end=?, event_type=?, attendee_count=?,
+                has_video=?, has_conference_link=?, updated_at=?,
+                scored_at=NULL, impact_score=NULL, impact_label=NULL, reasons_json=NULL,
+                scoring_source=NULL, scoring_model=NULL
+            WHERE id=? AND user_id=?
+            """,
+            (
+                title,
+                start_iso,
+                end_iso,
+                event_type,
+                attendee_count,
+                has_video,
+                has_conference_link,
+                now_iso,
+                event_id,
+                user_id,
+            ),
+        )
+        if cur.rowcount == 0:
+            # Deleted between the read above and this write
+            return JSONResponse({"error": "Event not found"}, status_code=404)
+        _persist_score(conn, event_id, user_id, score)
+
+    base = {
+        **_row_to_eventdict(row),
+        "title": title,
+        "start": start_iso,
+        "end": end_iso,
+        "event_type": event_type,
+        "attendee_count": attendee_count,
+        "has_video": bool(has_video),
+        "has_conference_link": bool(has_conference_link),
+    }
 
     return {
         "event": {
-            **_row_to_eventdict(row2),
+            **base,
             "impact_score": float(score.get("impact_score", 0.0) or 0.0),
             "impact_label": _normalize_label(score.get("impact_label", "Low")),
             "reasons": score.get("reasons", []) or [],
@@ -948,13 +2498,11 @@ def update_event_db(event_id: str, request: Request, payload: dict = Body(...)):
 def delete_event_db(event_id: str, request: Request):
     user_id = _require_user_id(request)
 
-    conn = get_db()
-    cur = conn.execute(
-        "DELETE FROM events WHERE id = ? AND user_id = ?",
-        (event_id, user_id),
-    )
-    conn.commit()
-    conn.close()
+    with db.write() as conn:
+        cur = conn.execute(
+            "DELETE FROM events WHERE id = ? AND user_id = ?",
+            (event_id, user_id),
+        )
 
     if cur.rowcount == 0:
         return JSONResponse({"error": "Event not found"}, status_code=404)
@@ -965,6 +2513,36 @@ def delete_event_db(event_id: str, request: Request):
 # ------------------
 # ✅ Part B: Google Overrides endpoint
 # ------------------
+_UPSERT_OVERRIDE_SQL = """
+    INSERT INTO google_overrides (user_id, event_id, event_type, attendee_count, has_video, has_conference_link, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(user_id, event_id) DO UPDATE SET
+        event_type=COALESCE(excluded.event_type, google_overrides.event_type),
+        attendee_count=COALESCE(excluded.attendee_count, google_overrides.attendee_count),
+        has_video=COALESCE(excluded.has_video, google_overrides.has_video),
+        has_conference_link=COALESCE(excluded.has_conference_link, google_overrides.has_conference_link),
+        updated_at=excluded.updated_at
+"""
+
+# SQLite 3.35+ can hand back the written rows, saving the read before the write
+_SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Same upsert, but only inserts when the user's google event exists (no read beforehand).
+# The trg_override_invalidate_* triggers clear the event's score as part of it.
+_UPSERT_GOOGLE_OVERRIDE_RETURNING_SQL = """
+    INSERT INTO google_overrides (user_id, event_id, event_type, attendee_count, has_video, has_conference_link, updated_at)
+    SELECT ?1, ?2, ?3, ?4, ?5, ?6, ?7
+    WHERE EXISTS (SELECT 1 FROM events WHERE id=?2 AND user_id=?1 AND source='google')
+    ON CONFLICT(user_id, event_id) DO UPDATE SET
+        event_type=COALESCE(excluded.event_type, google_overrides.event_type),
+        attendee_count=COALESCE(excluded.attendee_count, google_overrides.attendee_count),
+        has_video=COALESCE(excluded.has_video, google_overrides.has_video),
+        has_conference_link=COALESCE(excluded.has_conference_link, google_overrides.has_conference_link),
+        updated_at=excluded.updated_at
+    RETURNING event_type, attendee_count, has_video, has_conference_link
+"""
+
+
 @app.put("/api/events/google_overrides/{event_id}")
 def update_google_overrides(event_id: str, request: Request, payload: dict = Body(...)):
     user_id = _require_user_id(request)
@@ -991,92 +2569,52 @@ def update_google_overrides(event_id: str, request: Request, payload: dict = Bod
         except Exception:
             return JSONResponse({"error": "attendee_count must be an integer"}, status_code=400)
 
-    now_iso = datetime.now(timezone.utc).isoformat()
-
-    conn = get_db()
+    if has_video is not None:
+        has_video = int(bool(has_video))
+    if has_conference_link is not None:
+        has_conference_link = int(bool(has_conference_link))
 
-    # Ensure the event exists and belongs to user and is google
-    row = conn.execute(
-        "SELECT * FROM events WHERE id=? AND user_id=?",
-        (event_id, user_id),
-    ).fetchone()
-    if not row:
-        conn.close()
-        return JSONResponse({"error": "Event not found"}, status_code=404)
-    if row["source"] != "google":
-        conn.close()
-        return JSONResponse({"error": "Overrides are only for google events"}, status_code=400)
+    now_iso = datetime.now(timezone.utc).isoformat()
 
-    # Upsert overrides (store NULLs if omitted -> but we only want to update provided fields)
-    # We'll read current overrides first, then merge.
-    cur_ov = conn.execute(
-        """
-        SELECT event_type, attendee_count, has_video, has_conference_link
-        FROM google_overrides
-        WHERE user_id=? AND event_id=?
-        """,
-        (user_id, event_id),
-    ).fetchone()
-
-    merged_event_type = event_type if event_type is not None else (cur_ov["event_type"] if cur_ov else None)
-    merged_attendee_count = attendee_count if attendee_count is not None else (cur_ov["attendee_count"] if cur_ov else None)
-    merged_has_video = None
-    merged_has_conference_link = None
+    override_params = (user_id, event_id, event_type, attendee_count, has_video, has_conference_link, now_iso)
 
-    if has_video is not None:
-        merged_has_video = int(bool(has_video))
-    else:
-        merged_has_video = cur_ov["has_video"] if cur_ov else None
+    if _SQLITE_HAS_RETURNING:
+        with db.write() as conn:
+            # Returns the overrides as stored, after the COALESCE merge; the trigger has
+            # already forced the rescore
+            ov = conn.execute(_UPSERT_GOOGLE_OVERRIDE_RETURNING_SQL, override_params).fetchone()
+            if not ov:
+                found = conn.execute("SELECT 1 FROM events WHERE id = ? AND user_id = ?", (event_id, user_id)).fetchone()
+                if not found:
+                    return JSONResponse({"error": "Event not found"}, status_code=404)
+                return JSONResponse({"error": "Overrides are only for google events"}, status_code=400)
 
-    if has_conference_link is not None:
-        merged_has_conference_link = int(bool(has_conference_link))
-    else:
-        merged_has_conference_link = cur_ov["has_conference_link"] if cur_ov else None
+            row = conn.execute(_EVENT_BY_ID_SQL, (event_id, user_id)).fetchone()
 
-    conn.execute(
-        """
-        INSERT INTO google_overrides (user_id, event_id, event_type, attendee_count, has_video, has_conference_link, updated_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(user_id, event_id) DO UPDATE SET
-            event_type=excluded.event_type,
-            attendee_count=excluded.attendee_count,
-            has_video=excluded.has_video,
-            has_conference_link=excluded.has_conference_link,
-            updated_at=excluded.updated_at
-        """,
-        (
-            user_id,
-            event_id,
-            merged_event_type,
-            merged_attendee_count,
-            merged_has_video,
-            merged_has_conference_link,
-            now_iso,
-        ),
-    )
+        merged = _apply_overrides(
+            _row_to_eventdict(row), ov["event_type"], ov["attendee_count"], ov["has_video"], ov["has_conference_link"]
+        )
+        return {"ok": True, "event": merged}
 
-    # ✅ Force rescore by updating the events.updated_at + clearing cached score
-    conn.execute(
-        """
-        UPDATE events
-        SET updated_at=?,
-            scored_at=NULL, impact_score=NULL, impact_label=NULL, reasons_json=NULL,
-            scoring_source=NULL, scoring_model=NULL
-        WHERE id=? AND user_id=?
-        """,
-        (now_iso, event_id, user_id),
-    )
+    # One transaction from the existence check through both writes; one commit
+    with db.write(immediate=True) as conn:
+        # Ensure the event exists and belongs to user and is google
+        row = conn.execute(_EVENT_JOINED_BY_ID_SQL, (event_id, user_id)).fetchone()
+        if not row:
+            return JSONResponse({"error": "Event not found"}, status_code=404)
+        if row["source"] != "google":
+            return JSONResponse({"error": "Overrides are only for google events"}, status_code=400)
 
-    conn.commit()
+        # Omitted fields are bound as NULL; the upsert's COALESCE keeps their current override.
+        # ✅ The trg_override_invalidate_* triggers force the rescore
+        conn.execute(_UPSERT_OVERRIDE_SQL, override_params)
 
     # Return merged event snapshot (so frontend can refresh, but we still recommend loadEvents())
-    row2 = conn.execute(
-        "SELECT * FROM events WHERE id=? AND user_id=?",
-        (event_id, user_id),
-    ).fetchone()
-
-    merged = _merged_event_row(conn, user_id, row2)
-    conn.close()
+    # The trigger only touched score columns, so the row with its previous overrides,
+    # plus the provided fields on top (same rule as the COALESCE), is current
+    merged = _apply_overrides(
+        _merged_joined_row(row), event_type, attendee_count, has_video, has_conference_link
+    )
 
     return {"ok": True, "event": merged}
 
@@ -1084,83 +2622,163 @@ def update_google_overrides(event_id: str, request: Request, payload: dict = Bod
 # ------------------
 # GOOGLE SYNC -> DB
 # ------------------
-@app.post("/api/google/sync")
-def sync_google_into_db(request: Request, hours: int = 24):
-    user_id = _require_user_id(request)
-    creds = _get_google_creds_from_session(request)
-    if not creds:
-        return JSONResponse({"error": "Not authenticated, go to /auth/login"}, status_code=401)
+_UPSERT_GOOGLE_EVENT_SQL = """
+    INSERT INTO events (
+      id, user_id, source, title, start, end, event_type,
+      attendee_count, has_video, has_conference_link, modifiers_json, updated_at
+    )
+    VALUES (?, ?, 'google', ?, ?, ?, ?, ?, ?, ?, NULL, ?)
+    ON CONFLICT(id) DO UPDATE SET
+      title=excluded.title,
+      start=excluded.start,
+      end=excluded.end,
+      event_type=excluded.event_type,
+      attendee_count=excluded.attendee_count,
+      has_video=excluded.has_video,
+      has_conference_link=excluded.has_conference_link,
+      updated_at=excluded.updated_at,
+      scored_at=NULL,
+      impact_score=NULL,
+      impact_label=NULL,
+      reasons_json=NULL,
+      scoring_source=NULL,
+      scoring_model=NULL
+"""
 
-    service = build("calendar", "v3", credentials=creds)
 
-    now = datetime.now(timezone.utc)
-    time_min = now.isoformat()
-    time_max = (now + timedelta(hours=hours)).isoformat()
+_DELETE_GOOGLE_EVENT_SQL = "DELETE FROM events WHERE id = ? AND user_id = ? AND source = 'google'"
+_DELETE_OVERRIDE_SQL = "DELETE FROM google_overrides WHERE event_id = ? AND user_id = ?"
 
-    resp = (
-        service.events()
-        .list(
-            calendarId="primary",
-            timeMin=time_min,
-            timeMax=time_max,
-            singleEvents=True,
-            orderBy="startTime",
-            maxResults=250,
+_UPSERT_SYNC_STATE_SQL = """
+    INSERT INTO google_sync_state (user_id, sync_token, time_max, updated_at)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(user_id) DO UPDATE SET
+      sync_token=excluded.sync_token,
+      time_max=excluded.time_max,
+      updated_at=excluded.updated_at
+"""
+
+
+def _google_pages(service, **params):
+    """
+    Yields each events.list response page for the primary calendar.
+    Google only returns nextSyncToken on the last page.
+    """
+    page_token = None
+    while True:
+        resp = (
+            service.events()
+            .list(calendarId="primary", singleEvents=True, maxResults=250, pageToken=page_token, **params)
+            .execute()
         )
-        .execute()
-    )
+        yield resp
+        page_token = resp.get("nextPageToken")
+        if not page_token:
+            return
 
-    items = resp.get("items", [])
-    now_iso = datetime.now(timezone.utc).isoformat()
 
-    profile = request.session.get("profile") or {}
+def _prefetch(it, depth: int = 2):
+    """
+    Iterate `it` on a background thread, buffering at most `depth` items, so the next
+    page downloads while the caller processes the current one. Errors re-raise here.
+    """
+    buf: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buf.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for x in it:
+                if not put((x, None)):
+                    return
+            put((done, None))
+        except BaseException as e:
+            put((done, e))
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            x, err = buf.get()
+            if x is done:
+                if err is not None:
+                    raise err
+                return
+            yield x
+    finally:
+        # Caller stopped early: let the producer exit instead of blocking on a full buffer
+        stop.set()
+
+
+def _fetch_google_changes(service, user_id: str, now: datetime, time_max: str) -> tuple:
+    """
+    Pages of events to apply for a sync up to time_max: (pages, token_time_max, incremental).
+    Uses the stored syncToken when its full sync reached at least time_max, so only changed
+    (or cancelled) events come back; otherwise, or when Google expired the token (410),
+    lists everything from now to the sync horizon. Pages after the first are prefetched.
+    """
+    with db.read() as conn:
+        state = conn.execute(
+            "SELECT sync_token, time_max FROM google_sync_state WHERE user_id = ?", (user_id,)
+        ).fetchone()
+
+    # syncToken can't be combined with timeMin/timeMax; it keeps the original window.
+    # Compared as datetimes: stored rows may carry another offset or precision than time_max.
+    if state and _parse_timestamp(state["time_max"]) >= _parse_timestamp(time_max):
+        pages = _google_pages(service, syncToken=state["sync_token"])
+        try:
+            # An expired token fails on the first request, before anything is applied
+            first = next(pages)
+        except HttpError as e:
+            if e.resp.status != 410:
+                raise
+        else:
+            return chain((first,), _prefetch(pages)), state["time_max"], True
+
+    horizon_dt = max(_parse_timestamp(time_max), now + timedelta(hours=GOOGLE_SYNC_HORIZON_HOURS))
+    horizon = horizon_dt.isoformat()
+    pages = _google_pages(service, timeMin=now.isoformat(), timeMax=horizon)
+    return _prefetch(pages), horizon, False
 
-    conn = get_db()
-    upserted = 0
 
+def _google_page_rows(items: list, user_id: str, now_iso: str) -> tuple:
+    """
+    (upsert rows, cancelled (id, user_id) pairs) for one page of Google events.
+    """
+    rows_to_upsert = []
+    cancelled = []
     for evt in items:
-        start_dt, _ = _event_datetime(evt, "start")
-        end_dt, _ = _event_datetime(evt, "end")
+        # Only incremental lists include cancelled events
+        if evt.get("status") == "cancelled":
+            if evt.get("id"):
+                cancelled.append((evt["id"], user_id))
+            continue
+
+        _, start_iso = _event_datetime(evt, "start")
+        _, end_iso = _event_datetime(evt, "end")
 
-        if not start_dt or not end_dt:
+        if not start_iso or not end_iso:
             continue
 
         attendees = evt.get("attendees") or []
         attendees_count = max(0, len(attendees))
         summary = evt.get("summary") or "No Title"
-        has_conference = bool(evt.get("conferenceData")) or bool(evt.get("hangoutLink"))
+        has_video, has_conference = _conference_flags(evt)
         etype = _infer_event_type(attendees_count, summary, has_conference)
 
         event_id = evt.get("id", "")
         if not event_id:
             continue
 
-        start_iso = _to_utc_iso(start_dt)
-        end_iso = _to_utc_iso(end_dt)
-
-        conn.execute(
-            """
-            INSERT INTO events (
-              id, user_id, source, title, start, end, event_type,
-              attendee_count, has_video, has_conference_link, modifiers_json, updated_at
-            )
-            VALUES (?, ?, 'google', ?, ?, ?, ?, ?, ?, ?, NULL, ?)
-            ON CONFLICT(id) DO UPDATE SET
-              title=excluded.title,
-              start=excluded.start,
-              end=excluded.end,
-              event_type=excluded.event_type,
-              attendee_count=excluded.attendee_count,
-              has_video=excluded.has_video,
-              has_conference_link=excluded.has_conference_link,
-              updated_at=excluded.updated_at,
-              scored_at=NULL,
-              impact_score=NULL,
-              impact_label=NULL,
-              reasons_json=NULL,
-              scoring_source=NULL,
-              scoring_model=NULL
-            """,
+        rows_to_upsert.append(
             (
                 event_id,
                 user_id,
@@ -1169,47 +2787,90 @@ def sync_google_into_db(request: Request, hours: int = 24):
                 end_iso,
                 etype.value,
                 attendees_count,
-                int(has_conference),
+                int(has_video),
                 int(has_conference),
                 now_iso,
-            ),
+            )
         )
-        upserted += 1
 
-    conn.commit()
+    return rows_to_upsert, cancelled
 
-    # Score all events in the window missing scores
-    rows = conn.execute(
-        """
-        SELECT * FROM events
-        WHERE user_id = ?
-          AND start < ?
-          AND end > ?
-        ORDER BY start ASC
-        """,
-        (user_id, time_max, time_min),
-    ).fetchall()
 
-    for r in rows:
-        merged = _merged_event_row(conn, user_id, r)
-        if _read_score_from_row(r) is None or _needs_rescore(r):
-            ne = NormalizedEvent(
-                id=r["id"],
-                title=r["title"],
-                start=_parse_dt(r["start"]),
-                end=_parse_dt(r["end"]),
-                event_type=EventType(merged["event_type"]),
-                attendee_count=int(merged.get("attendee_count") or 0),
-                has_video=bool(merged.get("has_video")),
-                has_conference_link=bool(merged.get("has_conference_link")),
-            )
-            score = _llm_score_event(ne, profile)
-            _persist_score(conn, r["id"], user_id, score)
+@app.post("/api/google/sync")
+def sync_google_into_db(request: Request, hours: int = 24):
+    user_id = _require_user_id(request)
+    creds = _get_google_creds_from_session(request)
+    if not creds:
+        return JSONResponse({"error": "Not authenticated, go to /auth/login"}, status_code=401)
+
+    service = _calendar_service(creds)
+
+    now = datetime.now(timezone.utc)
+    time_min = now.isoformat()
+    time_max = (now + timedelta(hours=hours)).isoformat()
+
+    pages, token_time_max, incremental = _fetch_google_changes(service, user_id, now, time_max)
+    now_iso = datetime.now(timezone.utc).isoformat()
+
+    profile = request.session.get("profile") or {}
+
+    # Each page is written as it arrives, while the next one downloads. Upserts and deletes
+    # are idempotent, so if a later page fails, the next sync (with the old token) redoes it.
+    upserted = deleted = 0
+    sync_token = None
+    for page in pages:
+        rows_to_upsert, cancelled = _google_page_rows(page.get("items", []), user_id, now_iso)
+        if rows_to_upsert or cancelled:
+            with db.write() as conn:
+                if rows_to_upsert:
+                    conn.executemany(_UPSERT_GOOGLE_EVENT_SQL, rows_to_upsert)
+                if cancelled:
+                    conn.executemany(_DELETE_GOOGLE_EVENT_SQL, cancelled)
+                    conn.executemany(_DELETE_OVERRIDE_SQL, cancelled)
+        upserted += len(rows_to_upsert)
+        deleted += len(cancelled)
+        sync_token = page.get("nextSyncToken") or sync_token
+
+    # The new token is only stored once every page has been applied
+    with db.write() as conn:
+        if sync_token:
+            conn.execute(_UPSERT_SYNC_STATE_SQL, (user_id, sync_token, token_time_max, now_iso))
+        else:
+            conn.execute("DELETE FROM google_sync_state WHERE user_id = ?", (user_id,))
 
-    conn.commit()
-    conn.close()
+    # A bulk (usually first, full) sync can change the events table's shape enough that
+    # the stats from startup mislead the planner about the window index
+    if upserted >= SYNC_ANALYZE_MIN_ROWS:
+        with db.write() as conn:
+            conn.execute("ANALYZE events")
 
-    return {"synced": upserted, "window_hours": hours}
+    # Score all events in the window missing scores
+    with db.read() as conn:
+        rows = conn.execute(_EVENTS_TO_SCORE_SQL, (user_id, time_max, time_min)).fetchall()
+
+    to_score = [_ScoreInput.from_row(r, _merged_joined_row(r)) for r in rows]
+
+    pending = 0
+    if _background_scoring_enabled():
+        # Respond right after the upserts; the scoring worker persists the scores and
+        # pushes them to /api/events/stream subscribers. Each event is queued at the version
+        # just written, so an older copy still in flight can't overwrite it.
+        for r, ne in zip(rows, to_score):
+            _enqueue_scoring(user_id, ne, profile, r["updated_at"])
+        pending = len(to_score)
+    else:
+        scores = _llm_score_events_batch(to_score, profile)
+        if scores:
+            with db.write() as conn:
+                _persist_scores(conn, user_id, [(ne.id, score) for ne, score in zip(to_score, scores)])
+
+    return {
+        "synced": upserted,
+        "deleted": deleted,
+        "incremental": incremental,
+        "scoring_pending": pending,
+        "window_hours": hours,
+    }
 
 
 # ------------------
@@ -1224,7 +2885,7 @@ def get_calendar_events(request: Request, hours: int = 24):
     profile = request.session.get("profile") or {}
     personality_score = int(profile.get("personality_score", 30) or 30)
 
-    service = build("calendar", "v3", credentials=creds)
+    service = _calendar_service(creds)
     now = datetime.now(timezone.utc)
     time_min = now.isoformat()
     time_max = (now + timedelta(hours=hours)).isoformat()
@@ -1239,8 +2900,8 @@ def get_calendar_events(request: Request, hours: int = 24):
     ).execute()
 
     items = resp.get("items", [])
-    events_flat = []
 
+    nes = []
     for evt in items:
         start_dt, _ = _event_datetime(evt, "start")
         end_dt, _ = _event_datetime(evt, "end")
@@ -1250,26 +2911,28 @@ def get_calendar_events(request: Request, hours: int = 24):
         attendees = evt.get("attendees") or []
         attendees_count = max(0, len(attendees))
         summary = evt.get("summary") or "No Title"
-        has_conference = bool(evt.get("conferenceData")) or bool(evt.get("hangoutLink"))
+        has_video, has_conference = _conference_flags(evt)
 
         etype = _infer_event_type(attendees_count, summary, has_conference)
 
-        ne = NormalizedEvent(
-            id=evt.get("id", ""),
-            title=summary,
-            start=_parse_dt(start_dt),
-            end=_parse_dt(end_dt),
-            event_type=etype,
-            attendee_count=attendees_count,
-            has_conference_link=has_conference,
-            has_video=has_conference,
+        nes.append(
+            NormalizedEvent(
+                id=evt.get("id", ""),
+                title=summary,
+                start=start_dt,
+                end=end_dt,
+                event_type=etype,
+                attendee_count=attendees_count,
+                has_conference_link=has_conference,
+                has_video=has_video,
+            )
         )
 
-        s = score_event(ne, personality_score=personality_score).model_dump()
-        impact_score = float(s.get("impact_score", 0.0) or 0.0)
-        impact_label = _normalize_label(s.get("impact_label", "Low"))
-        reasons = s.get("reasons", []) or []
+    # Convert to columns once and score the whole window in one pass
+    scores = score_results(EventColumns.from_events(nes), personality_score=personality_score)
 
+    events_flat = []
+    for ne, s in zip(nes, scores):
         events_flat.append(
             {
                 "id": ne.id,
@@ -1278,9 +2941,9 @@ def get_calendar_events(request: Request, hours: int = 24):
                 "end": ne.end.isoformat(),
                 "location": None,
                 "event_type": ne.event_type.value,
-                "impact_score": impact_score,
-                "impact_label": impact_label,
-                "reasons": reasons,
+                "impact_score": float(s.impact_score),
+                "impact_label": _normalize_label(s.impact_label),
+                "reasons": s.reasons,
             }
         )
 
@@ -0,0 +1,18 @@
+"""
+Optional: compile the Cython scoring kernel in place.
+
+    cd backend && python setup.py build_ext --inplace
+
+Without it, scoring falls back to the Numba / pure-Python kernel.
+"""
+
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+setup(
+    name="social-battery-forecaster-kernels",
+    ext_modules=cythonize(
+        [Extension("app.core._scoring_cy", ["app/core/_scoring_cy.pyx"])],
+        language_level=3,
+    ),
+)
@@ -0,0 +1,192 @@
+"""
+Scoring path equivalence tests. Run from backend/:
+
+    python -m pytest -q
+"""
+
+from datetime import datetime, timedelta, timezone
+from itertools import product
+
+import numpy as np
+import pytest
+
+from app.core.schemas import (
+    Control,
+    Environment,
+    EventType,
+    ImpactLabel,
+    NormalizedEvent,
+    Role,
+    ScoreResult,
+    ScoringModifiers,
+)
+from app.core.scoring import RawEvent, _label_for_impact, score_event
+from app.core.scoring_batch import (
+    CONTROL_ARR,
+    ENV_ARR,
+    ROLE_ARR,
+    EventColumns,
+    _raw_product,
+    _raw_product_q16,
+    impact_labels,
+    score_events,
+    score_results,
+)
+
+_START = datetime(2026, 1, 5, 9, 0, tzinfo=timezone.utc)
+
+_PERSONALITY_SCORES = (0, 30, 50, 100)
+
+
+def _event_grid(durations=(0, 15, 45, 120)):
+    """
+    One NormalizedEvent per combination of event type, duration and modifiers.
+    """
+    events = []
+    grid = product(
+        EventType,
+        durations,
+        Role,
+        Control,
+        Environment,
+        (0.0, 0.5, 1.0),
+        (False, True),
+        (False, True),
+    )
+    for i, (etype, minutes, role, control, env, fam, b2b, video) in enumerate(grid):
+        events.append(
+            NormalizedEvent(
+                id=f"e{i}",
+                title="grid",
+                start=_START,
+                end=_START + timedelta(minutes=minutes),
+                event_type=etype,
+                has_video=video,
+                modifiers=ScoringModifiers(
+                    role=role,
+                    control=control,
+                    environment=env,
+                    familiarity=fam,
+                    back_to_back=b2b,
+                ),
+            )
+        )
+    return events
+
+
+_EVENTS = _event_grid()
+
+
+@pytest.mark.parametrize("personality_score", _PERSONALITY_SCORES)
+def test_fast_score_event_matches_validated(personality_score):
+    for ev in _EVENTS:
+        raw = RawEvent.from_normalized(ev)
+        validated = score_event(raw, personality_score)
+        fast = score_event(raw, personality_score, _fast=True)
+
+        assert fast == validated
+        assert type(fast.impact_label) is ImpactLabel
+        assert ScoreResult.model_validate(fast.model_dump()) == validated
+
+
+@pytest.mark.parametrize("personality_score", _PERSONALITY_SCORES)
+def test_batch_results_are_well_formed_score_results(personality_score):
+    results = score_results(_EVENTS, personality_score)
+
+    assert len(results) == len(_EVENTS)
+    for ev, res in zip(_EVENTS, results):
+        expected = score_event(RawEvent.from_normalized(ev), personality_score)
+
+        assert type(res.impact_score) is float
+        assert type(res.impact_label) is ImpactLabel
+        assert res.reasons == expected.reasons
+        # The unvalidated batch objects still round-trip through the validated model
+        assert ScoreResult.model_validate(res.model_dump()) == res
+
+
+def test_unvalidated_events_use_their_own_modifiers():
+    modifiers = ScoringModifiers(
+        role=Role.lead, control=Control.optional, environment=Environment.high_stim
+    )
+    validated = NormalizedEvent(
+        id="v",
+        title="grid",
+        start=_START,
+        end=_START + timedelta(minutes=45),
+        event_type=EventType.meeting,
+        modifiers=modifiers,
+    )
+    constructed = NormalizedEvent.model_construct(**dict(validated))
+    copied = validated.model_copy(update={"modifiers": ScoringModifiers()})
+
+    for ev in (constructed, copied):
+        expected = RawEvent.from_fields(ev.event_type, ev.start, ev.end, ev.has_video, ev.modifiers)
+        assert RawEvent.from_normalized(ev) == expected
+
+    cols = EventColumns.from_events([constructed, copied])
+    assert list(cols.role_i) == [0, 1]
+    assert list(cols.ctrl_i) == [0, 1]
+    assert list(cols.env_i) == [2, 1]
+
+
+@pytest.mark.parametrize("fixed_point", (False, True))
+@pytest.mark.parametrize("personality_score", _PERSONALITY_SCORES)
+def test_batch_scores_match_scalar(personality_score, fixed_point):
+    batch = score_events(_EVENTS, personality_score, fixed_point=fixed_point)
+    scalar = np.array(
+        [score_event(RawEvent.from_normalized(ev), personality_score).impact_score for ev in _EVENTS]
+    )
+
+    assert np.max(np.abs(batch - scalar)) <= 0.01 + 1e-9
+
+
+def test_impact_labels_match_scalar_at_thresholds():
+    impacts = []
+    for t in (0.0, 2.0, 6.0, 12.0):
+        for x in (t - 0.01, t, t + 0.01):
+            impacts += [x, -x]
+    impacts = np.array(impacts)
+
+    labels = impact_labels(impacts)
+
+    assert list(labels) == [_label_for_impact(float(x)).value for x in impacts]
+
+
+def _raw_product_f64(cols: EventColumns, p_mult: float) -> np.ndarray:
+    """
+    float64 reference for the batch product, in score_event's multiply order.
+    """
+    return (
+        cols.base_cost.astype(np.float64)
+        * (1.0 + 0.4 * (cols.dur_min / 60.0))
+        * np.where(cols.b2b, 1.3, 1.0)
+        * ROLE_ARR[cols.role_i].astype(np.float64)
+        * (1.0 - 0.25 * cols.fam.astype(np.float64))
+        * CONTROL_ARR[cols.ctrl_i].astype(np.float64)
+        * ENV_ARR[cols.env_i].astype(np.float64)
+        * np.where(cols.video, 1.15, 1.0)
+        * p_mult
+    )
+
+
+# Durations up to a full day push the product to its largest magnitudes
+_WIDE_COLS = EventColumns.from_events(_event_grid(durations=(0, 1, 59, 480, 1440)))
+
+# The personality table's ends (1.3 / 0.7), the 0.6 floor scoring relies on, and beyond
+_EXTREME_P_MULTS = (0.6, 0.7, 1.0, 1.3, 2.0)
+
+
+@pytest.mark.parametrize("p_mult", _EXTREME_P_MULTS)
+def test_float32_and_q16_products_match_float64(p_mult):
+    ref = _raw_product_f64(_WIDE_COLS, p_mult)
+
+    assert np.max(np.abs(_raw_product(_WIDE_COLS, p_mult) - ref)) < 0.01
+    assert np.max(np.abs(_raw_product_q16(_WIDE_COLS, p_mult) - ref)) < 0.01
+
+
+@pytest.mark.parametrize("personality_score", _PERSONALITY_SCORES)
+def test_fixed_point_scores_match_float_scores(personality_score):
+    float_scores = score_events(_WIDE_COLS, personality_score)
+    fixed_scores = score_events(_WIDE_COLS, personality_score, fixed_point=True)
+
+    assert np.max(np.abs(fixed_scores - float_scores)) <= 0.01 + 1e-9
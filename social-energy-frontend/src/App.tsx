@@ -11,6 +11,7 @@ import {
   getEvents,
   getMe,
   submitOnboarding,
+  subscribeScoreUpdates,
   updateEvent,
   updateGoogleOverride,
 } from "./api";
@@ -154,6 +155,13 @@ export default function App() {
     }
   }, [me?.authenticated, me?.onboarded]);
 
+  React.useEffect(() => {
+    if (!me?.authenticated || !me?.onboarded) return;
+    return subscribeScoreUpdates((u) => {
+      setEvents((prev) => prev.map((ev) => (ev.id === u.id ? { ...ev, ...u } : ev)));
+    });
+  }, [me?.authenticated, me?.onboarded]);
+
   React.useEffect(() => {
     const fn = () => loadEvents();
     window.addEventListener("refresh-events", fn);
@@ -1,4 +1,4 @@
-import type { EventsResponse, MeResponse, Profile } from "./types";
+import type { EventsResponse, MeResponse, Profile, ScoreUpdate } from "./types";
 
 // In dev, use Vite proxy (same-origin, no CORS pain)
 // In prod, MUST use VITE_API_BASE_URL (full backend origin)
@@ -74,6 +74,19 @@ export async function getEvents(hours = 24): Promise<EventsResponse> {
   return apiFetch<EventsResponse>(`/api/events?hours=${hours}`);
 }
 
+// Background LLM scores for events returned as "pending"; returns an unsubscribe function
+export function subscribeScoreUpdates(onUpdate: (u: ScoreUpdate) => void): () => void {
+  const es = new EventSource(joinUrl(API_BASE, "/api/events/stream"), { withCredentials: true });
+  es.onmessage = (msg) => {
+    try {
+      onUpdate(JSON.parse(msg.data) as ScoreUpdate);
+    } catch {
+      // ignore malformed messages
+    }
+  };
+  return () => es.close();
+}
+
 export async function syncGoogle(
   hours = 24
 ): Promise<{ synced: number; window_hours: number }> {
@@ -21,6 +21,16 @@ export type ScoredEvent = {
   impact_score: number;
   impact_label: ImpactLabel;
   reasons?: string[];
+  // "pending": provisional local score, the LLM score arrives on /api/events/stream
+  scoring_status?: "scored" | "pending";
+};
+
+export type ScoreUpdate = {
+  id: string;
+  impact_score: number;
+  impact_label: ImpactLabel;
+  reasons: string[];
+  scoring_status: "scored";
 };
 
 export type EventsResponse = {